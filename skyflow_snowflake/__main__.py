@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Skyflow Snowflake Integration Setup Tool
+
+Modern Python CLI using Snowflake SDK for secure PII tokenization.
+"""
+
+import sys
+
+_USAGE = """\
+usage: skyflow-snowflake [-h] [--verbose] [--config CONFIG]
+                {create,destroy,recreate,verify,config-test} ...
+
+Skyflow Snowflake Integration Setup Tool
+
+commands:
+  create PREFIX       Create a new Skyflow Snowflake integration
+  destroy PREFIX      Destroy an existing Skyflow Snowflake integration
+  recreate PREFIX     Recreate a Skyflow Snowflake integration (destroy then create)
+  verify PREFIX       Verify an existing Skyflow Snowflake integration
+  config-test         Test configuration and Snowflake connection
+
+options:
+  -h, --help          show this help message and exit
+  --version           show the installed version and exit
+  --verbose, -v       Enable verbose logging
+  --quiet, -q         Single-line summaries, no tables or panels
+  --config, -c CONFIG Configuration file path (default: .env.local)"""
+
+import argparse
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=1)
+def _console():
+    """Create the shared Rich console on first use.
+
+    Importing rich is deferred so that --help/--version and argument
+    errors never pay the import cost.
+    """
+    from rich.console import Console
+
+    return Console()
+
+
+@functools.lru_cache(maxsize=1)
+def _styles():
+    """Precompile the handful of styles the CLI prints with.
+
+    Passing Style objects to console.print bypasses rich's per-call
+    markup parsing. Lazy for the same reason as _console().
+    """
+    import types
+    from rich.style import Style
+
+    return types.SimpleNamespace(
+        err=Style(color="red"),
+        info=Style(color="blue"),
+        phase=Style(color="blue", bold=True),
+        warn=Style(color="yellow"),
+        ok=Style(color="green", bold=True),
+    )
+
+
+def _fast_exit(code):
+    """Exit immediately once output is flushed.
+
+    os._exit skips interpreter finalization (atexit handlers, module
+    teardown of the Snowflake connector and rich), which is dead time for
+    a short-lived CLI. Callers must close their connection first. Under
+    -X dev we fall back to sys.exit so finalization checks still run.
+    """
+    if sys.flags.dev_mode:
+        sys.exit(code)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
+
+def _run(fn):
+    """Wrap a command handler with the shared error path.
+
+    Errors print once and exit 1; the per-command bodies no longer carry
+    identical try/except blocks. The rich traceback handler is only
+    installed for --verbose runs that actually raise, keeping rich off
+    the happy path and off quiet error paths.
+    """
+    @functools.wraps(fn)
+    def wrapper(args):
+        try:
+            return fn(args)
+        except SystemExit:
+            raise
+        except Exception as e:
+            if getattr(args, 'verbose', False):
+                from rich.traceback import install
+                install(show_locals=True)
+                _console().print(f"Error: {e}", style=_styles().err)
+            else:
+                print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    return wrapper
+
+
+def _setup_logging(args):
+    """Configure logging from parsed CLI arguments."""
+    from skyflow_snowflake.utils.logging import setup_logging
+
+    log_level = "DEBUG" if args.verbose else "INFO"
+    return setup_logging(log_level)
+
+
+@_run
+def create(args):
+    """Create a new Skyflow Snowflake integration."""
+    from skyflow_snowflake.cli.commands import CreateCommand
+    from skyflow_snowflake.config.config import SetupConfig
+
+    _setup_logging(args)
+    with SetupConfig.load(args.config) as config:
+        command = CreateCommand(args.prefix, config)
+        success = command.execute()
+    _fast_exit(0 if success else 1)
+
+
+@_run
+def destroy(args):
+    """Destroy an existing Skyflow Snowflake integration."""
+    from skyflow_snowflake.cli.commands import DestroyCommand
+    from skyflow_snowflake.config.config import SetupConfig
+
+    _setup_logging(args)
+    with SetupConfig.load(args.config) as config:
+        command = DestroyCommand(args.prefix, config)
+        success = command.execute()
+    _fast_exit(0 if success else 1)
+
+
+@_run
+def recreate(args):
+    """Recreate a Skyflow Snowflake integration (destroy then create)."""
+    from skyflow_snowflake.cli.commands import DestroyCommand
+    from skyflow_snowflake.config.config import SetupConfig
+
+    _setup_logging(args)
+
+    # Share one SetupConfig (and therefore one Snowflake connection)
+    # across both phases, and close it deterministically when done.
+    with SetupConfig.load(args.config) as config:
+        # Destroy first
+        _console().print("Phase 1: Destroying existing resources", style=_styles().phase)
+        destroy_command = DestroyCommand(args.prefix, config)
+        destroy_success = destroy_command.execute()
+
+        if destroy_command.fatal:
+            # Unrecoverable (auth/connection) failure: the create phase
+            # would hit the same error, so don't even load it.
+            _console().print("Destroy phase failed fatally - aborting recreate", style=_styles().err)
+            sys.exit(1)
+
+        if not destroy_success:
+            _console().print("Warning: Destroy phase had some errors, continuing with create...", style=_styles().warn)
+
+        # Create new (imported only once destroy has not fatally failed)
+        from skyflow_snowflake.cli.commands import CreateCommand
+
+        _console().print("\nPhase 2: Creating new resources", style=_styles().phase)
+        create_command = CreateCommand(args.prefix, config)
+        create_success = create_command.execute()
+
+    _fast_exit(0 if create_success else 1)
+
+
+@_run
+def verify(args):
+    """Verify an existing Skyflow Snowflake integration."""
+    from skyflow_snowflake.cli.commands import VerifyCommand
+    from skyflow_snowflake.config.config import SetupConfig
+
+    _setup_logging(args)
+    with SetupConfig.load(args.config) as config:
+        command = VerifyCommand(args.prefix, config)
+        success = command.execute()
+    _fast_exit(0 if success else 1)
+
+
+@_run
+def config_test(args):
+    """Test configuration and Snowflake connection."""
+    from skyflow_snowflake.config.config import SetupConfig
+
+    _setup_logging(args)
+    console = _console()
+    config = SetupConfig.load(args.config)
+    console.print("Testing configuration...", style=_styles().info)
+    config.validate()
+
+    # Test connection: the connector caches session context as attributes,
+    # so read those instead of paying a metadata query round trip. Fall
+    # back to a single-shot query only if any attribute is unset.
+    connection = config.connection
+    user = connection.user
+    role = connection.role
+    warehouse = connection.warehouse
+    database = connection.database
+    if not all((user, role, warehouse, database)):
+        cursor = connection.cursor()
+        cursor.execute("SELECT CURRENT_USER(), CURRENT_ROLE(), CURRENT_WAREHOUSE(), CURRENT_DATABASE()")
+        user, role, warehouse, database = cursor.fetchone()
+        cursor.close()
+    console.print(f"✓ Connected to Snowflake as: {user}")
+    console.print(f"✓ Role: {role}")
+    console.print(f"✓ Warehouse: {warehouse}")
+    console.print(f"✓ Database: {database}")
+
+    console.print("✓ Configuration test passed", style=_styles().ok)
+
+
+DISPATCH = {
+    'create': create,
+    'destroy': destroy,
+    'recreate': recreate,
+    'verify': verify,
+    'config-test': config_test,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the top-level argument parser (once per process)."""
+    parser = argparse.ArgumentParser(
+        prog='skyflow-snowflake',
+        description='Skyflow Snowflake Integration Setup Tool',
+    )
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--config', '-c', default='.env.local', help='Configuration file path')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Single-line summaries, no tables or panels')
+
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    sub.add_parser('create', help='Create a new Skyflow Snowflake integration').add_argument('prefix')
+    sub.add_parser('destroy', help='Destroy an existing Skyflow Snowflake integration').add_argument('prefix')
+    sub.add_parser('recreate', help='Recreate a Skyflow Snowflake integration (destroy then create)').add_argument('prefix')
+    sub.add_parser('verify', help='Verify an existing Skyflow Snowflake integration').add_argument('prefix')
+    sub.add_parser('config-test', help='Test configuration and Snowflake connection')
+
+    return parser
+
+
+def main() -> None:
+    """CLI entry point."""
+    # Early exit for trivial invocations: --help/no-args print a static
+    # usage string, --version the installed version, before any
+    # application module is loaded.
+    if len(sys.argv) == 1 or sys.argv[1] in ('-h', '--help'):
+        print(_USAGE)
+        sys.exit(0)
+    if sys.argv[1] == '--version':
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            print(f"skyflow-snowflake {version('skyflow-snowflake')}")
+        except PackageNotFoundError:
+            # Running from a source checkout without an installed dist.
+            print("skyflow-snowflake (not installed)")
+        sys.exit(0)
+
+    args = build_parser().parse_args()
+    if args.quiet:
+        # Summary printers across the command modules key off this.
+        os.environ["SKYFLOW_QUIET"] = "1"
+    DISPATCH[args.cmd](args)
+
+
+if __name__ == '__main__':
+    main()
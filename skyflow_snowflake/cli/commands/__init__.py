@@ -0,0 +1,26 @@
+"""CLI command implementations for Snowflake Skyflow integration.
+
+Command classes are re-exported lazily (PEP 562) so that importing one
+command does not load the others or their Snowflake dependencies.
+"""
+
+import importlib
+
+_LAZY = {
+    "BaseCommand": ".base",
+    "CreateCommand": ".create",
+    "DestroyCommand": ".destroy",
+    "VerifyCommand": ".verify",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    try:
+        module = importlib.import_module(_LAZY[name], __name__)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,90 @@
+"""Shared base class for CLI commands."""
+
+from typing import Optional
+from rich.console import Console
+
+from ...config.config import SetupConfig
+from ...utils.validation import validate_prefix
+
+console = Console()
+
+
+class BaseCommand:
+    """Base class for all commands."""
+
+    __slots__ = ("prefix", "config", "_conn", "_substitutions", "_roles")
+
+    def __init__(self, prefix: str, config: Optional[SetupConfig] = None):
+        self.prefix = prefix
+        self.config = config or SetupConfig()
+        self._conn = None
+        self._substitutions = None
+        self._roles = None
+        
+        # Validate prefix
+        is_valid, error = validate_prefix(prefix)
+        if not is_valid:
+            raise ValueError(f"Invalid prefix: {error}")
+
+    @property
+    def connection(self):
+        """Shared Snowflake connection for this command.
+
+        Resolved once and reused by every manager a command constructs, so
+        a whole create/destroy run authenticates a single time. Reopens
+        transparently (via SetupConfig) if the server recycled the handle.
+        """
+        if self._conn is None or self._conn.is_closed():
+            self._conn = self.config.connection
+        return self._conn
+
+    @property
+    def database_name(self) -> str:
+        """Prefixed database name used by every step."""
+        return f"{self.prefix}_database"
+
+    @property
+    def substitutions(self) -> dict:
+        """SQL template substitutions for this prefix (computed once)."""
+        if self._substitutions is None:
+            self._substitutions = self.config.get_substitutions(self.prefix)
+        return self._substitutions
+
+    @property
+    def roles(self) -> tuple:
+        """Prefixed (plain_text, masked, redacted) role names (computed once)."""
+        if self._roles is None:
+            groups = self.config.groups
+            self._roles = (
+                f"{self.prefix}_{groups.plain_text_groups.upper()}",
+                f"{self.prefix}_{groups.masked_groups.upper()}",
+                f"{self.prefix}_{groups.redacted_groups.upper()}",
+            )
+        return self._roles
+
+    @property
+    def plain_text_role(self) -> str:
+        return self.roles[0]
+
+    @property
+    def masked_role(self) -> str:
+        return self.roles[1]
+
+    @property
+    def redacted_role(self) -> str:
+        return self.roles[2]
+
+    def __enter__(self) -> 'BaseCommand':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.config.close()
+        self._conn = None
+    
+    def validate_environment(self):
+        """Validate environment and configuration."""
+        try:
+            self.config.validate()
+        except ValueError as e:
+            console.print(f"[red]Configuration error: {e}[/red]")
+            raise
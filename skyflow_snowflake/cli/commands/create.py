@@ -0,0 +1,604 @@
+"""Implementation of the 'create' command."""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence
+from rich.console import Console, Group
+from rich.panel import Panel
+from rich.table import Table
+
+from ...utils.validation import validate_required_files
+from .base import BaseCommand
+
+if TYPE_CHECKING:
+    from ...snowflake_ops.snowflake_manager import SnowflakeResourceManager
+    from ...snowflake_ops.secrets import SnowflakeSecretsManager
+    from ...snowflake_ops.sql import SnowflakeSQLExecutor
+    from ...snowflake_ops.notebooks import StoredProcedureManager
+    from ...snowflake_ops.dashboards import SnowsightDashboardManager
+
+console = Console()
+
+# Serializes console output from concurrently running setup steps.
+_print_lock = threading.Lock()
+
+
+class _StepOutput:
+    """Buffers one step's console lines for a single console.print.
+
+    Steps run concurrently; emitting their output line by line both
+    interleaves unrelated steps and pays rich's render/lock cost per
+    line. Each step collects its lines here and flushes them as one
+    Group under the print lock.
+    """
+
+    __slots__ = ("lines",)
+
+    def __init__(self, header: str):
+        self.lines = [header]
+
+    def print(self, message: str) -> None:
+        self.lines.append(message)
+
+    def flush(self) -> None:
+        with _print_lock:
+            console.print(Group(*self.lines))
+
+
+class _Step:
+    """One node in the create-pipeline dependency DAG."""
+
+    __slots__ = ("name", "label", "fn", "deps", "required", "warn")
+
+    def __init__(self, name: str, label: str, fn: Callable[[], bool],
+                 deps: Sequence[str] = (), required: bool = True,
+                 warn: Optional[str] = None):
+        self.name = name
+        self.label = label
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.required = required
+        self.warn = warn
+
+
+class CreateCommand(BaseCommand):
+    """Implementation of 'create' command."""
+
+    __slots__ = ("_step_local",)
+
+    def execute(self) -> bool:
+        """Execute the create command."""
+        console.print(Panel.fit(
+            f"Creating Skyflow Snowflake Integration: [bold]{self.prefix}[/bold]",
+            style="green"
+        ))
+        
+        self._step_local = threading.local()
+
+        try:
+            # Validate environment
+            self.validate_environment()
+            
+            # Check required files exist
+            required_files = [
+                "sql/setup/create_sample_table.sql", 
+                "sql/setup/create_external_functions.sql",
+                "sql/setup/setup_external_functions.sql",
+                "sql/setup/apply_column_masks.sql",
+                "notebooks/notebook_tokenize_table.ipynb",
+                "dashboards/customer_insights_dashboard.lvdash.json"
+            ]
+            
+            files_exist, missing = validate_required_files(required_files)
+            if not files_exist:
+                console.print(f"[red]Missing required files: {', '.join(missing)}[/red]")
+                return False
+            
+            # Manager modules (and transitively snowflake.connector) are
+            # imported only once we are actually going to talk to Snowflake;
+            # early failures above never pay for them.
+            from ...snowflake_ops.snowflake_manager import SnowflakeResourceManager
+            from ...snowflake_ops.secrets import SnowflakeSecretsManager
+            from ...snowflake_ops.sql import SnowflakeSQLExecutor
+            from ...snowflake_ops.notebooks import StoredProcedureManager
+            from ...snowflake_ops.dashboards import SnowsightDashboardManager
+
+            # Initialize managers against the one shared connection
+            connection = self.connection
+            resource_manager = SnowflakeResourceManager(connection)
+            secrets_manager = SnowflakeSecretsManager(connection)
+            sql_executor = SnowflakeSQLExecutor(connection)
+            procedure_manager = StoredProcedureManager(connection)
+            dashboard_manager = SnowsightDashboardManager(connection)
+
+            # Clean up only what already exists: a snapshot of three SHOW
+            # probes decides whether the destroy pass is needed at all,
+            # so a greenfield install skips its ~10 round trips.
+            snapshot = resource_manager.snapshot_existing(self.prefix, list(self.roles))
+            if snapshot.empty:
+                console.print(f"[dim]No existing '{self.prefix}' resources found - skipping cleanup[/dim]")
+            else:
+                console.print(f"[dim]Cleaning up existing '{self.prefix}' resources...[/dim]")
+                from .destroy import DestroyCommand
+
+                destroy_command = DestroyCommand(self.prefix, self.config)
+                destroy_command.execute(selective=snapshot)  # Don't fail if destroy has issues
+
+            # Get substitutions (memoized on the command)
+            substitutions = self.substitutions
+            
+            # The steps form a dependency DAG rather than a strict serial
+            # pipeline; independent branches (secrets, network rules,
+            # sample data) run concurrently. The connector releases the
+            # GIL during network I/O, so a small thread pool overlaps the
+            # server round trips.
+            results = {}
+            dashboard_url_box = {}
+
+            def _dashboard_step() -> bool:
+                dashboard_url_box['url'] = self._create_dashboard(dashboard_manager)
+                return True
+
+            def _masks_step() -> bool:
+                # Masks must only be applied to tokenized data.
+                if not results.get('tokenize'):
+                    self._print("[yellow]⚠ Skipping masking policies - tokenization failed[/yellow]")
+                    return True
+                return self._setup_functions(sql_executor, substitutions)
+
+            steps = [
+                _Step('database_schema', 'Setting up Snowflake database and schema',
+                      lambda: self._setup_database_schema(resource_manager)),
+                _Step('roles', 'Creating required Snowflake roles',
+                      lambda: self._setup_roles(resource_manager),
+                      deps=['database_schema'], required=False,
+                      warn="Role creation failed - continuing (roles may already exist)"),
+                # Secrets are schema-level objects and the network-rules
+                # template both USEs the prefix database and references
+                # the PAT token secret, so neither can race ahead of its
+                # prerequisites on the shared connection.
+                _Step('secrets', 'Setting up secrets',
+                      lambda: self._setup_secrets(secrets_manager),
+                      deps=['database_schema']),
+                _Step('network_rules', 'Setting up network rules and external access',
+                      lambda: self._setup_network_rules(sql_executor, substitutions),
+                      deps=['database_schema', 'secrets']),
+                _Step('connections', 'Creating HTTP connections',
+                      lambda: self._setup_connections(sql_executor, substitutions),
+                      deps=['database_schema', 'secrets', 'network_rules']),
+                _Step('sample_data', 'Creating sample table',
+                      lambda: self._create_sample_data(sql_executor, substitutions),
+                      deps=['database_schema']),
+                _Step('procedure', 'Creating tokenization stored procedure',
+                      lambda: self._create_tokenization_procedure(procedure_manager, substitutions),
+                      deps=['connections']),
+                _Step('verify_functions', 'Verifying functions',
+                      lambda: self._verify_functions(sql_executor, substitutions),
+                      deps=['connections', 'procedure'], required=False,
+                      warn="Function verification failed - continuing"),
+                _Step('tokenize', 'Running tokenization',
+                      lambda: self._execute_tokenization(procedure_manager),
+                      deps=['procedure', 'sample_data', 'verify_functions'], required=False,
+                      warn="Tokenization failed - continuing with setup"),
+                _Step('masks', 'Applying masking policies to tokenized data',
+                      _masks_step,
+                      deps=['tokenize'], required=False,
+                      warn="Masking policies failed - continuing without them"),
+                _Step('dashboard', 'Creating dashboard',
+                      _dashboard_step,
+                      deps=['sample_data'], required=False,
+                      warn="Dashboard creation failed - continuing"),
+                _Step('validate_roles', 'Validating role-based access',
+                      lambda: self._validate_role_access(sql_executor),
+                      deps=['roles', 'masks'], required=False,
+                      warn="Role validation failed - check role permissions"),
+            ]
+
+            if not self._run_steps(steps, results):
+                return False
+
+            # Success summary
+            self._print_success_summary(dashboard_url_box.get('url'))
+            return True
+            
+        except Exception as e:
+            console.print(f"[red]Setup failed: {e}[/red]")
+            return False
+    
+    def _run_steps(self, steps: List[_Step], results: dict) -> bool:
+        """Run the setup steps respecting their dependency DAG.
+
+        Zero in-degree steps are submitted to a small thread pool; each
+        completion unlocks its successors. A required-step failure (or a
+        failed dependency) cancels everything still pending and aborts.
+        """
+        by_name = {step.name: step for step in steps}
+        successors = {step.name: [] for step in steps}
+        in_degree = {}
+        for step in steps:
+            in_degree[step.name] = len(step.deps)
+            for dep in step.deps:
+                successors[dep].append(step.name)
+
+        ready = deque(name for name, degree in in_degree.items() if degree == 0)
+        step_no = 0
+        failed = False
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            running = {}
+            while ready or running:
+                while ready and not failed:
+                    name = ready.popleft()
+                    step = by_name[name]
+                    step_no += 1
+                    running[executor.submit(self._run_step_buffered, step, step_no)] = step
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        success = bool(future.result())
+                    except Exception as e:
+                        with _print_lock:
+                            console.print(f"[red]✗ {step.label} failed: {e}[/red]")
+                        success = False
+                    results[step.name] = success
+
+                    if not success:
+                        if step.required:
+                            failed = True
+                        elif step.warn:
+                            with _print_lock:
+                                console.print(f"[yellow]⚠ {step.warn}[/yellow]")
+
+                    if success or not step.required:
+                        for succ in successors[step.name]:
+                            in_degree[succ] -= 1
+                            if in_degree[succ] == 0 and not failed:
+                                ready.append(succ)
+
+            if failed:
+                for future in running:
+                    future.cancel()
+                return False
+
+        return True
+
+    def _run_step_buffered(self, step: _Step, step_no: int) -> bool:
+        """Run one step with its output buffered and flushed as a unit."""
+        out = _StepOutput(f"\n[bold blue]Step {step_no}: {step.label}[/bold blue]")
+        self._step_local.out = out
+        try:
+            return bool(step.fn())
+        finally:
+            self._step_local.out = None
+            out.flush()
+
+    def _print(self, message: str) -> None:
+        """Print into the current step's buffer, or directly if outside one."""
+        out = getattr(self._step_local, 'out', None)
+        if out is not None:
+            out.print(message)
+        else:
+            with _print_lock:
+                console.print(message)
+
+    def _setup_database_schema(self, resource_manager: 'SnowflakeResourceManager') -> bool:
+        """Setup Snowflake database and schema."""
+        # One multi-statement round trip covers both DDLs.
+        return resource_manager.create_database_and_schema(
+            self.database_name,
+            self.config.snowflake.schema_name
+        )
+    
+    def _setup_roles(self, resource_manager: 'SnowflakeResourceManager') -> bool:
+        """Setup required Snowflake roles for data access control."""
+        # Prefixed role names come precomputed from BaseCommand
+        roles = list(self.roles)
+        
+        # Create roles with config for proper descriptions
+        success = resource_manager.create_required_roles(roles, self.config.groups)
+        
+        # Grant database access to roles
+        if success:
+            success &= resource_manager.grant_database_access_to_roles(self.database_name, roles)
+        
+        return success
+    
+    def _setup_secrets(self, secrets_manager: 'SnowflakeSecretsManager') -> bool:
+        """Setup Snowflake secrets."""
+        skyflow_config = {
+            "pat_token": self.config.skyflow.pat_token,
+            "vault_url": self.config.skyflow.vault_url,
+            "vault_id": self.config.skyflow.vault_id,
+            "table": self.config.skyflow.table,
+            "table_column": self.config.skyflow.table_column
+        }
+        
+        return secrets_manager.setup_skyflow_secrets(skyflow_config)
+    
+    def _setup_network_rules(self, sql_executor: 'SnowflakeSQLExecutor', substitutions: dict) -> bool:
+        """Setup network rules and external access integration for Skyflow API access."""
+        # SKYFLOW_VAULT_HOST (vault URL with the scheme stripped) is already
+        # part of the shared substitutions, so no per-call re-derivation.
+        return sql_executor.execute_sql_file(
+            "sql/setup/create_network_rules.sql",
+            substitutions
+        )
+    
+    def _setup_connections(self, sql_executor: 'SnowflakeSQLExecutor', substitutions: dict) -> bool:
+        """Setup API integrations and external functions using SQL."""
+        # Create API integrations using SQL file
+        success = sql_executor.execute_sql_file(
+            "sql/setup/create_external_functions.sql",
+            substitutions
+        )
+        
+        if success:
+            # Execute additional function setup SQL (detokenization functions)
+            success &= sql_executor.execute_sql_file(
+                "sql/setup/setup_external_functions.sql",
+                substitutions
+            )
+        
+        return success
+    
+    def _create_sample_data(self, sql_executor: 'SnowflakeSQLExecutor', substitutions: dict) -> bool:
+        """Create sample table and data."""
+        success = sql_executor.execute_sql_file(
+            "sql/setup/create_sample_table.sql",
+            substitutions
+        )
+        
+        if success:
+            # Check table exists first without counting rows (table might be empty initially)
+            table_name = f"{self.prefix}_customer_data"
+            if sql_executor.verify_table_exists(table_name):
+                self._print(f"  ✓ Created table: {table_name}")
+                row_count = sql_executor.get_table_row_count(table_name)
+                if row_count is not None and row_count > 0:
+                    self._print(f"  ✓ Table has {row_count} rows")
+                else:
+                    self._print(f"  ✓ Table created (empty)")
+        
+        return success
+    
+    def _setup_functions(self, sql_executor: 'SnowflakeSQLExecutor', substitutions: dict) -> bool:
+        """Setup detokenization functions and masking policies."""
+        return sql_executor.execute_sql_file(
+            "sql/setup/apply_column_masks.sql",
+            substitutions
+        )
+    
+    def _create_tokenization_procedure(self, procedure_manager: 'StoredProcedureManager', substitutions: dict) -> bool:
+        """Create the tokenization stored procedure."""
+        try:
+            batch_size = self.config.skyflow.batch_size
+            return procedure_manager.setup_tokenization_procedure(self.prefix, substitutions, batch_size)
+        except Exception as e:
+            self._print(f"✗ Procedure creation failed: {e}")
+            return False
+    
+    def _verify_functions(self, sql_executor: 'SnowflakeSQLExecutor', substitutions: dict) -> bool:
+        """Verify Snowflake functions exist."""
+        try:
+            # Poll for the functions instead of a fixed 5-second stall;
+            # function DDL is usually visible immediately.
+            self._print("Verifying function creation...")
+            self._wait_for_functions(sql_executor)
+
+            self._print("Verifying Snowflake detokenization functions...")
+            success = sql_executor.execute_sql_file("sql/verify/verify_functions.sql", substitutions)
+            if success:
+                self._print("✓ Snowflake conditional detokenization functions verified")
+            return success
+        except Exception as e:
+            self._print(f"✗ Function verification failed: {e}")
+            return False
+    
+    def _wait_for_functions(self, sql_executor: 'SnowflakeSQLExecutor', attempts: int = 10) -> bool:
+        """Poll INFORMATION_SCHEMA until the detokenize function appears.
+
+        Returns as soon as the function is visible; backs off briefly
+        between attempts and gives up after ~5 seconds total.
+        """
+        expected = f"{self.prefix}_skyflow_conditional_detokenize".upper()
+
+        for attempt in range(attempts):
+            try:
+                cursor = sql_executor.connection.cursor()
+                cursor.execute(
+                    f"SELECT FUNCTION_NAME FROM {self.database_name}.INFORMATION_SCHEMA.FUNCTIONS "
+                    "WHERE FUNCTION_NAME = %s",
+                    (expected,)
+                )
+                rows = cursor.fetchall()
+                cursor.close()
+                if rows:
+                    return True
+            except Exception:
+                pass  # Keep polling; the schema may not be queryable yet
+
+            time.sleep(0.25 * (1.5 ** attempt))
+
+        return False
+
+    def _execute_tokenization(self, procedure_manager: 'StoredProcedureManager') -> bool:
+        """Execute the tokenization stored procedure."""
+        try:
+            # Get batch size from config
+            batch_size = self.config.skyflow.batch_size
+            return procedure_manager.execute_tokenization_notebook(self.prefix, batch_size)
+        except Exception as e:
+            self._print(f"✗ Tokenization execution failed: {e}")
+            return False
+    
+    def _create_dashboard(self, dashboard_manager: 'SnowsightDashboardManager') -> Optional[str]:
+        """Create the customer insights dashboard."""
+        return dashboard_manager.setup_customer_insights_dashboard(
+            self.prefix,
+            self.config.snowflake.warehouse
+        )
+    
+    def _validate_role_access(self, sql_executor: 'SnowflakeSQLExecutor') -> bool:
+        """Validate role-based access by testing queries as each role."""
+        try:
+            table_name = f"{self.prefix}_customer_data"
+            
+            # Check if table has tokenized data
+            row_count = sql_executor.get_table_row_count(table_name)
+            if not row_count or row_count == 0:
+                self._print("  ⚠ No data in table - skipping role validation")
+                return True
+            
+            # Get prefixed role names (precomputed on BaseCommand)
+            plain_text_role, masked_role, redacted_role = self.roles
+            
+            validation_results = []
+            
+            # Test each role
+            roles_to_test = [
+                (plain_text_role, "PLAIN_TEXT", "should see detokenized data"),
+                (masked_role, "MASKED", "should see masked data"),
+                (redacted_role, "REDACTED", "should see redacted data")
+            ]
+            
+            # Send all role validations (and the switch back to the admin
+            # role) in one execute_string call. The connector still runs
+            # them sequentially - one round trip per statement, not one
+            # total; a true single round trip would need num_statements
+            # batching, which can't interleave USE ROLE context switches
+            # with reads. Falls back to per-role execution if the batch
+            # fails, so a single broken role still gets pinpointed.
+            statements = []
+            for role_name, expected_type, description in roles_to_test:
+                self._print(f"  Testing role: {role_name} ({description})")
+                statements.append(f"USE ROLE {role_name}")
+                statements.append(f"USE DATABASE {self.database_name}")
+                statements.append(f"SELECT first_name, email FROM {table_name} LIMIT 1")
+            statements.append(f"USE ROLE {self.config.snowflake.role}")
+            big_sql = ";\n".join(statements) + ";"
+
+            # Run on a pooled connection so the USE ROLE switches never
+            # leak into the shared session other steps may still be using.
+            with self.config.acquire() as conn:
+                try:
+                    cursors = conn.execute_string(big_sql, return_cursors=True)
+                    # Each role contributes three cursors; its SELECT is the third.
+                    for i, (role_name, expected_type, description) in enumerate(roles_to_test):
+                        result = cursors[3 * i + 2].fetchone()
+                        if result:
+                            first_name, email = result[0], result[1]
+                            self._print(f"    ✓ {role_name}: first_name='{first_name}', email='{email}'")
+                            validation_results.append(True)
+                        else:
+                            self._print(f"    ✗ {role_name}: No data returned")
+                            validation_results.append(False)
+                    for cursor in cursors:
+                        cursor.close()
+                except Exception:
+                    validation_results = self._validate_roles_individually(
+                        conn, roles_to_test, table_name)
+
+            success_count = sum(validation_results)
+            total_count = len(validation_results)
+            
+            if success_count == total_count:
+                self._print(f"  ✓ All {total_count} role validation tests passed")
+                return True
+            else:
+                self._print(f"  ⚠ {success_count}/{total_count} role validation tests passed")
+                return False
+                
+        except Exception as e:
+            self._print(f"  ✗ Role validation failed: {e}")
+            return False
+
+    def _validate_roles_individually(self, conn, roles_to_test: list, table_name: str) -> list:
+        """Per-role fallback when the batched validation payload fails."""
+        validation_results = []
+
+        # One cursor for the whole fallback; the SELECT is rendered once
+        # with a fully-qualified table name so no USE DATABASE is needed
+        # per role either.
+        select_sql = f"SELECT first_name, email FROM {self.database_name}.PUBLIC.{table_name} LIMIT 1"
+        cursor = conn.cursor()
+        try:
+            for role_name, expected_type, description in roles_to_test:
+                try:
+                    cursor.execute(f"USE ROLE {role_name}")
+                    cursor.execute(select_sql)
+                    result = cursor.fetchone()
+
+                    if result:
+                        first_name, email = result[0], result[1]
+                        self._print(f"    ✓ {role_name}: first_name='{first_name}', email='{email}'")
+                        validation_results.append(True)
+                    else:
+                        self._print(f"    ✗ {role_name}: No data returned")
+                        validation_results.append(False)
+
+                except Exception as e:
+                    self._print(f"    ✗ {role_name}: Query failed - {e}")
+                    validation_results.append(False)
+
+            # Switch back to admin role
+            try:
+                cursor.execute(f"USE ROLE {self.config.snowflake.role}")
+            except:
+                pass
+        finally:
+            cursor.close()
+
+        return validation_results
+
+    def _print_success_summary(self, dashboard_url: Optional[str]):
+        """Print success summary with resources created."""
+        # Piped/CI output (or --quiet) gets one plain line instead of a
+        # rich Table and Panel render nobody will look at.
+        if not console.is_terminal or os.environ.get("SKYFLOW_QUIET"):
+            print(f"OK {self.prefix}" + (f" dashboard={dashboard_url}" if dashboard_url else ""))
+            return
+
+        console.print("\n" + "="*60)
+        console.print(Panel.fit(
+            f"[bold green]✓ Setup Complete: {self.prefix}[/bold green]",
+            style="green"
+        ))
+        
+        # Resources table
+        table = Table(title="Resources Created")
+        table.add_column("Resource", style="cyan")
+        table.add_column("Name", style="green")
+        
+        table.add_row("Snowflake Database", self.database_name)
+        table.add_row("Sample Table", f"{self.prefix}_customer_data")
+        # Show the actual prefixed role names that were created
+        table.add_row("Snowflake Roles", ", ".join(self.roles))
+        table.add_row("Snowflake Secret", "SKYFLOW_PAT_TOKEN")
+        table.add_row("API Integration", "SKYFLOW_API_INTEGRATION")
+        table.add_row("Tokenization Procedure", f"{self.prefix}_TOKENIZE_TABLE")
+        table.add_row("Masking Policies", f"{self.prefix}_pii_mask")
+        
+        if dashboard_url:
+            table.add_row("Dashboard", f"{self.prefix}_customer_insights_dashboard")
+        
+        console.print(table)
+        
+        if dashboard_url:
+            console.print(f"\n[bold]Dashboard URL:[/bold] {dashboard_url}")
+        
+        console.print("\n[bold]Next Steps:[/bold]")
+        console.print(f"1. Grant roles to users:")
+        console.print(f"   GRANT ROLE {self.plain_text_role} TO USER your_user;")
+        console.print(f"   GRANT ROLE {self.masked_role} TO USER your_customer_service;")
+        console.print(f"   GRANT ROLE {self.redacted_role} TO USER your_marketing;")
+        console.print("2. Test role-based access by running queries as different users")
+        console.print("3. Explore the dashboard to see detokenization in action")
+        console.print("4. Use the SQL functions in your own queries and applications")
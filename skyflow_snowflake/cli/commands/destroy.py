@@ -0,0 +1,313 @@
+"""Implementation of the 'destroy' command."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+from rich.console import Console
+from rich.panel import Panel
+
+from .base import BaseCommand
+
+if TYPE_CHECKING:
+    from ...snowflake_ops.snowflake_manager import ResourceSnapshot, SnowflakeResourceManager
+    from ...snowflake_ops.secrets import SnowflakeSecretsManager
+
+console = Console()
+
+
+class DestroyCommand(BaseCommand):
+    """Implementation of 'destroy' command."""
+
+    __slots__ = ("fatal",)
+
+    def execute(self, selective: Optional['ResourceSnapshot'] = None) -> bool:
+        """Execute the destroy command.
+
+        With a ResourceSnapshot, only resources the snapshot says exist
+        are destroyed; create passes one in so a greenfield install skips
+        the cleanup round trips entirely.
+        """
+        # Set when destroy dies outright (auth/connection failure) rather
+        # than merely failing to delete some resources; recreate uses it
+        # to skip the create phase that would hit the same error.
+        self.fatal = False
+        if selective is not None and selective.empty:
+            console.print(f"✓ No existing '{self.prefix}' resources found - nothing to destroy")
+            return True
+        console.print(Panel.fit(
+            f"Destroying Skyflow Snowflake Integration: [bold]{self.prefix}[/bold]",
+            style="red"
+        ))
+        
+        try:
+            self.validate_environment()
+            
+            # Heavy manager modules are imported only when destroy really
+            # runs; selective no-op destroys above skip them entirely.
+            from ...snowflake_ops.snowflake_manager import SnowflakeResourceManager
+            from ...snowflake_ops.secrets import SnowflakeSecretsManager
+            from ...snowflake_ops.sql import SnowflakeSQLExecutor
+            from ...snowflake_ops.notebooks import StoredProcedureManager
+            from ...snowflake_ops.dashboards import SnowsightDashboardManager
+
+            # Initialize managers against the one shared connection
+            connection = self.connection
+            resource_manager = SnowflakeResourceManager(connection)
+            secrets_manager = SnowflakeSecretsManager(connection)
+            procedure_manager = StoredProcedureManager(connection)
+            dashboard_manager = SnowsightDashboardManager(connection)
+            sql_executor = SnowflakeSQLExecutor(connection)
+
+            # Standalone destroys take their own snapshot, so a clean
+            # slate costs three probes instead of the full ten steps.
+            if selective is None:
+                selective = resource_manager.snapshot_existing(self.prefix, list(self.roles))
+                if selective.empty:
+                    console.print(f"✓ No existing '{self.prefix}' resources found - nothing to destroy")
+                    return True
+
+            database_name = self.database_name
+            database_present = selective.database
+
+            # Track successful and failed deletions for validation
+            successful_deletions = []
+            failed_deletions = []
+            
+            # Step 1: Delete dashboard
+            console.print("\n[bold blue]Step 1: Removing dashboard[/bold blue]")
+            dashboard_name = f"{self.prefix}_customer_insights_dashboard"
+            dashboard_id = dashboard_manager.find_dashboard_by_name(dashboard_name)
+            if dashboard_id:
+                if dashboard_manager.delete_dashboard(dashboard_id):
+                    successful_deletions.append(f"Dashboard: {dashboard_name}")
+                    # Validate deletion
+                    if dashboard_manager.find_dashboard_by_name(dashboard_name):
+                        failed_deletions.append(f"Dashboard: {dashboard_name} (still exists)")
+                else:
+                    failed_deletions.append(f"Dashboard: {dashboard_name}")
+            else:
+                console.print(f"✓ Dashboard '{dashboard_name}' doesn't exist")
+                successful_deletions.append(f"Dashboard: {dashboard_name} (didn't exist)")
+            
+            # Step 2: Delete stored procedure
+            console.print("\n[bold blue]Step 2: Removing stored procedure[/bold blue]")
+            procedure_name = f"{self.prefix}_TOKENIZE_TABLE"
+            if not database_present:
+                console.print(f"✓ Procedure '{procedure_name}' doesn't exist (no database)")
+                successful_deletions.append(f"Procedure: {procedure_name} (didn't exist)")
+            elif procedure_manager.delete_notebook(procedure_name):  # Using compatibility method
+                successful_deletions.append(f"Procedure: {procedure_name}")
+                # Note: Validation handled in delete method
+            
+            # Step 3: Remove masking policies before dropping functions/table
+            console.print("\n[bold blue]Step 3: Removing masking policies[/bold blue]")
+            # Get full substitutions (memoized on the command)
+            substitutions = self.substitutions
+            if database_present:
+                if sql_executor.execute_sql_file("sql/destroy/remove_column_masks.sql", substitutions):
+                    successful_deletions.append("Masking policies removed")
+                else:
+                    console.print("✓ Masking policies removal skipped (may not exist)")
+                    successful_deletions.append("Masking policies (skipped)")
+            else:
+                console.print("✓ Masking policies removal skipped (database doesn't exist)")
+                successful_deletions.append("Masking policies (database didn't exist)")
+            
+            # Step 4: Drop functions and policies
+            console.print("\n[bold blue]Step 4: Dropping Snowflake functions and policies[/bold blue]")
+            if database_present:
+                if sql_executor.execute_sql_file("sql/destroy/drop_functions.sql", substitutions):
+                    successful_deletions.append("Snowflake functions and policies")
+                else:
+                    failed_deletions.append("Snowflake functions and policies")
+            else:
+                console.print(f"✓ Database '{database_name}' doesn't exist, skipping function cleanup")
+                successful_deletions.append("Functions (database didn't exist)")
+            
+            # Step 5: Drop table
+            console.print("\n[bold blue]Step 5: Dropping sample table[/bold blue]")
+            if database_present:
+                if sql_executor.execute_sql_file("sql/destroy/drop_table.sql", substitutions):
+                    successful_deletions.append("Sample table")
+                else:
+                    failed_deletions.append("Sample table")
+            else:
+                successful_deletions.append("Sample table (database didn't exist)")
+            
+            # Step 6: Delete network rules and external access integration (before database)
+            console.print("\n[bold blue]Step 6: Cleaning up network rules and external access[/bold blue]")
+            if sql_executor.execute_sql_file("sql/destroy/drop_network_rules.sql", substitutions):
+                successful_deletions.append("Network rules and external access integration")
+            else:
+                failed_deletions.append("Network rules and external access integration")
+            
+            # Step 7: Delete database (after all database-specific objects)
+            console.print("\n[bold blue]Step 7: Removing Snowflake database[/bold blue]")
+            if not database_present:
+                console.print(f"✓ Database '{database_name}' doesn't exist")
+                successful_deletions.append(f"Database: {database_name} (didn't exist)")
+            elif resource_manager.drop_database(database_name):
+                successful_deletions.append(f"Database: {database_name}")
+                # Validate database deletion
+                if resource_manager.database_exists(database_name):
+                    failed_deletions.append(f"Database: {database_name} (still exists)")
+            else:
+                failed_deletions.append(f"Database: {database_name}")
+            
+            # Steps 8-10: API integration, roles, and secrets have no
+            # dependencies on each other once the database is gone, so fan
+            # them out over a small thread pool.
+            console.print("\n[bold blue]Steps 8-10: Cleaning up API integration, roles, and secrets[/bold blue]")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = []
+                if selective.api_integration:
+                    futures.append(executor.submit(self._destroy_api_integration, resource_manager))
+                else:
+                    successful_deletions.append("API Integration: SKYFLOW_API_INTEGRATION (didn't exist)")
+                futures.append(executor.submit(self._destroy_roles, selective.roles))
+                if database_present:
+                    futures.append(executor.submit(self._destroy_secrets, secrets_manager, database_name))
+                else:
+                    successful_deletions.append("Skyflow PAT token secret (database didn't exist)")
+                for future in futures:
+                    ok, bad = future.result()
+                    successful_deletions.extend(ok)
+                    failed_deletions.extend(bad)
+            
+            # Print comprehensive validation summary
+            self._print_destroy_summary(successful_deletions, failed_deletions)
+            
+            # Return success only if all deletions succeeded and were validated
+            return len(failed_deletions) == 0
+            
+        except Exception as e:
+            self.fatal = True
+            console.print(f"[red]Destroy failed: {e}[/red]")
+            return False
+    
+    def _destroy_api_integration(self, resource_manager: 'SnowflakeResourceManager') -> tuple:
+        """Drop the API integration; returns (successful, failed) entries."""
+        successful, failed = [], []
+        integration_name = "SKYFLOW_API_INTEGRATION"
+        if resource_manager.drop_api_integration(integration_name):
+            successful.append(f"API Integration: {integration_name}")
+            # Validate integration deletion
+            if resource_manager.api_integration_exists(integration_name):
+                failed.append(f"API Integration: {integration_name} (still exists)")
+        # Note: If integration doesn't exist, drop_api_integration already handles this gracefully
+        return successful, failed
+
+    def _destroy_roles(self, existing_roles: set = None) -> tuple:
+        """Drop the prefixed roles; returns (successful, failed) entries."""
+        successful, failed = [], []
+        # Use same prefixed role names as creation (from BaseCommand)
+        roles_to_delete = list(self.roles)
+
+        # One SHOW ROLES instead of one LIKE probe per role; membership in
+        # the name set decides whether a DROP is needed at all. A caller
+        # holding a ResourceSnapshot passes its role set directly.
+        if existing_roles is None:
+            existing_roles = self._list_existing_roles()
+
+        roles_deleted = 0
+        for role_name in roles_to_delete:
+            if self._delete_role(role_name, existing_roles):
+                roles_deleted += 1
+            else:
+                failed.append(f"Role: {role_name}")
+
+        if roles_deleted == len(roles_to_delete):
+            successful.append(f"All {roles_deleted} Snowflake roles")
+        elif roles_deleted > 0:
+            successful.append(f"{roles_deleted}/{len(roles_to_delete)} Snowflake roles")
+        else:
+            failed.append("All Snowflake roles")
+        return successful, failed
+
+    def _destroy_secrets(self, secrets_manager: 'SnowflakeSecretsManager', database_name: str) -> tuple:
+        """Drop the Skyflow secrets; returns (successful, failed) entries."""
+        successful, failed = [], []
+        skyflow_secrets = ["SKYFLOW_PAT_TOKEN"]  # Only the sensitive PAT token is stored as secret
+        # One DROP SECRET IF EXISTS batch (qualified by database) replaces
+        # the per-secret precheck-then-drop pair of round trips.
+        if secrets_manager.drop_secrets_batch(skyflow_secrets, database_name):
+            successful.append("Skyflow PAT token secret")
+        else:
+            failed.append("Skyflow PAT token secret")
+        return successful, failed
+
+    def _list_existing_roles(self) -> set:
+        """Fetch all role names once for set-membership existence checks."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SHOW ROLES")
+            names = {row[1] for row in cursor.fetchall()}
+            cursor.close()
+            return names
+        except Exception:
+            # Fall back to per-role LIKE probes in _delete_role
+            return None
+
+    def _delete_role(self, role_name: str, existing_roles: set = None) -> bool:
+        """Delete a Snowflake role if it exists."""
+        from ...snowflake_ops.client import quote_ident
+
+        try:
+            # SHOW ROLES returns canonical (uppercase) names, so compare
+            # and drop by the uppercased identifier regardless of the
+            # prefix casing the user typed.
+            if existing_roles is not None:
+                if role_name.upper() not in existing_roles:
+                    console.print(f"✓ Role '{role_name}' doesn't exist")
+                    return True
+            cursor = self.connection.cursor()
+
+            if existing_roles is None:
+                # Check if role exists
+                cursor.execute(f"SHOW ROLES LIKE '{role_name}'")
+                if not cursor.fetchone():
+                    console.print(f"✓ Role '{role_name}' doesn't exist")
+                    cursor.close()
+                    return True
+            
+            # Drop role
+            cursor.execute(f"DROP ROLE {quote_ident(role_name)}")
+            cursor.close()
+            console.print(f"✓ Deleted role: {role_name}")
+            return True
+            
+        except Exception as e:
+            console.print(f"✗ Failed to delete role {role_name}: {e}")
+            return False
+    
+    def _print_destroy_summary(self, successful: list, failed: list):
+        """Print a detailed summary of destroy operation results."""
+        # Piped/CI output (or --quiet) gets one plain line instead of the
+        # itemized rich summary.
+        if not console.is_terminal or os.environ.get("SKYFLOW_QUIET"):
+            print(f"destroyed {self.prefix}: {len(successful)} ok, {len(failed)} failed")
+            return
+
+        console.print("\n" + "="*60)
+        console.print("[bold]Destroy Summary[/bold]")
+        
+        if successful:
+            console.print(f"\n[bold green]Successfully deleted ({len(successful)}):[/bold green]")
+            for item in successful:
+                console.print(f"  ✓ {item}")
+        
+        if failed:
+            console.print(f"\n[bold red]Failed to delete ({len(failed)}):[/bold red]")
+            for item in failed:
+                console.print(f"  ✗ {item}")
+            console.print("\n[yellow]Warning: Some resources could not be deleted or verified. Manual cleanup may be required.[/yellow]")
+            console.print(Panel.fit(
+                f"[bold red]⚠ Cleanup completed with {len(failed)} errors[/bold red]",
+                style="yellow"
+            ))
+        else:
+            console.print(Panel.fit(
+                f"[bold green]✓ All resources successfully deleted and validated[/bold green]",
+                style="green"
+            ))
@@ -1,17 +1,26 @@
 """Main configuration class for Snowflake Skyflow integration."""
 
+import atexit
+import functools
 import os
-from typing import Dict, Optional
-from pydantic import BaseModel, ValidationError
-import snowflake.connector
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, TYPE_CHECKING
+from pydantic import BaseModel, ConfigDict, ValidationError
 from .env_loader import EnvLoader
 
+if TYPE_CHECKING:
+    import snowflake.connector
+
 # Disable cloud metadata service calls to prevent warnings
 os.environ['NO_PROXY'] = '169.254.169.254'
 
 
 class SnowflakeConfig(BaseModel):
     """Snowflake configuration model."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
     account: str
     user: str
     warehouse: str
@@ -22,9 +31,46 @@ class SnowflakeConfig(BaseModel):
     pat_token: Optional[str] = None
     oauth_token: Optional[str] = None
 
+    @functools.cached_property
+    def connect_kwargs(self) -> Dict:
+        """Non-auth keyword arguments for snowflake.connector.connect.
+
+        Built once per config; auth is layered on by the caller since it
+        depends on which credential was provided.
+        """
+        kwargs = {
+            'account': self.account,
+            'user': self.user,
+            'warehouse': self.warehouse,
+            'schema': self.schema_name,
+            'role': self.role,
+            # Network timeout and retry parameters
+            'login_timeout': 120,  # Wait longer for network policy resolution
+            'network_timeout': 120,  # Extended timeout for network issues
+            'socket_timeout': 60,   # Socket-level timeout
+            'ocsp_fail_open': True,  # Allow connections if OCSP check fails
+            # Heartbeats keep the session and its sockets warm across
+            # pauses between setup phases; without them an idle session
+            # expires and the next query pays re-auth plus a fresh TLS
+            # handshake.
+            'client_session_keep_alive': True,
+            'client_session_keep_alive_heartbeat_frequency': 900,
+            # Keep HTTP connection pooling on: every small metadata
+            # query reuses the TLS session instead of re-handshaking.
+            'client_prefetch_threads': 8,  # Parallel result-chunk downloads
+            'client_request_mfa_token': False,
+        }
+        # Escape hatch: force a fresh HTTP connection per request. Only
+        # for debugging proxy/load-balancer issues - it pays a TCP+TLS
+        # handshake on every query.
+        if os.environ.get('SKYFLOW_DISABLE_POOLING'):
+            kwargs['disable_request_pooling'] = True
+        return kwargs
+
 
 class SkyflowConfig(BaseModel):
     """Skyflow configuration model."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
     vault_url: str
     vault_id: str
     pat_token: str
@@ -32,9 +78,15 @@ class SkyflowConfig(BaseModel):
     table_column: str  # Column name in Skyflow table
     batch_size: int  # Batch size for processing
 
+    @functools.cached_property
+    def vault_host(self) -> str:
+        """Vault URL with the scheme stripped (computed once per config)."""
+        return self.vault_url.replace('https://', '').replace('http://', '')
+
 
 class GroupConfig(BaseModel):
     """Group mapping configuration."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
     plain_text_groups: str
     masked_groups: str
     redacted_groups: str
@@ -42,13 +94,42 @@ class GroupConfig(BaseModel):
 
 class SetupConfig:
     """Main configuration manager for Snowflake Skyflow setup."""
-    
+
+    __slots__ = ("env_loader", "_snowflake_config", "_skyflow_config", "_group_config",
+                 "_connection", "_conn_params", "_pool", "_pool_lock", "_pool_opened")
+
+    # Upper bound on extra pooled connections handed out by acquire().
+    POOL_SIZE = 4
+
+    # Pooled connections idle longer than this are probed with SELECT 1
+    # before reuse; a dead one is replaced instead of handed out.
+    POOL_PROBE_IDLE_SECS = 300
+
     def __init__(self, env_file: str = ".env.local"):
         self.env_loader = EnvLoader(env_file)
         self._snowflake_config: Optional[SnowflakeConfig] = None
         self._skyflow_config: Optional[SkyflowConfig] = None
         self._group_config: Optional[GroupConfig] = None
-        self._connection: Optional[snowflake.connector.SnowflakeConnection] = None
+        self._connection: Optional['snowflake.connector.SnowflakeConnection'] = None
+        self._conn_params: Optional[Dict] = None
+        self._pool: queue.Queue = queue.Queue()
+        self._pool_lock = threading.Lock()
+        self._pool_opened = 0
+
+    @classmethod
+    def load(cls, env_file: str = ".env.local") -> 'SetupConfig':
+        """Return a cached SetupConfig for env_file.
+
+        Repeated loads of the same (unchanged) file within a process reuse
+        one instance instead of re-parsing the env file; the cache key
+        includes the file's mtime so edits invalidate it.
+        """
+        path = os.path.abspath(env_file)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        return _load_setup_config(path, mtime)
     
     @property
     def snowflake(self) -> SnowflakeConfig:
@@ -82,26 +163,25 @@ class SetupConfig:
     
     @property
     def connection(self) -> 'snowflake.connector.SnowflakeConnection':
-        """Get authenticated Snowflake connection."""
+        """Get authenticated Snowflake connection.
+
+        Acts as a pool of one: the handle is opened lazily, reused across
+        command phases in the same process, transparently reopened if the
+        server recycled it, and disposed at interpreter exit as a backstop
+        for callers that don't use the context manager.
+        """
+        if self._connection is not None and self._connection.is_closed():
+            self._connection = None
         if self._connection is None:
+            self._connection = self._open_connection()
+            atexit.register(self.close)
+        return self._connection
+
+    def _build_conn_params(self) -> Dict:
+        """Build (once) the keyword arguments for snowflake.connector.connect."""
+        if self._conn_params is None:
             config = self.snowflake
-            
-            # Build connection parameters with network optimization
-            conn_params = {
-                'account': config.account,
-                'user': config.user,
-                'warehouse': config.warehouse,
-                'schema': config.schema_name,
-                'role': config.role,
-                # Network timeout and retry parameters
-                'login_timeout': 120,  # Wait longer for network policy resolution
-                'network_timeout': 120,  # Extended timeout for network issues
-                'socket_timeout': 60,   # Socket-level timeout
-                'ocsp_fail_open': True,  # Allow connections if OCSP check fails
-                # Disable cloud metadata service detection to avoid warnings
-                'disable_request_pooling': True,
-                'client_request_mfa_token': False
-            }
+            conn_params = {**config.connect_kwargs}
             
             # Add authentication method
             if config.oauth_token:
@@ -116,9 +196,91 @@ class SetupConfig:
             else:
                 raise ValueError("Either SNOWFLAKE_PASSWORD, SNOWFLAKE_PAT_TOKEN, or SNOWFLAKE_OAUTH_TOKEN must be provided")
             
-            self._connection = snowflake.connector.connect(**conn_params)
-        return self._connection
+            self._conn_params = conn_params
+        return self._conn_params
+
+    def _open_connection(self) -> 'snowflake.connector.SnowflakeConnection':
+        """Open a new Snowflake connection from the cached parameters."""
+        # Imported here, not at module top: the connector drags in pyarrow
+        # and the crypto stack, and commands that fail validation (or
+        # --help) never pay for it.
+        import snowflake.connector
+        return snowflake.connector.connect(**self._build_conn_params())
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a pooled connection (opened lazily, up to POOL_SIZE).
+
+        For work that must not share session state with the primary
+        connection - e.g. role-switching validation - or that wants to
+        overlap queries with it. The connection returns to the pool on
+        exit.
+        """
+        conn = None
+        try:
+            conn, last_used = self._pool.get_nowait()
+            if conn.is_closed():
+                conn = self._open_connection()
+            elif time.monotonic() - last_used > self.POOL_PROBE_IDLE_SECS:
+                conn = self._probe_or_replace(conn)
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._pool_opened < self.POOL_SIZE
+                if can_open:
+                    self._pool_opened += 1
+            if can_open:
+                conn = self._open_connection()
+            else:
+                conn, _ = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put((conn, time.monotonic()))
+
+    def _probe_or_replace(self, conn) -> 'snowflake.connector.SnowflakeConnection':
+        """Health-check an idle pooled connection, replacing it if dead.
+
+        is_closed() only reflects client-side state; a connection the
+        server recycled during a long idle stretch still looks open, so
+        stale ones get a cheap SELECT 1 probe before being handed out.
+        """
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return conn
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            return self._open_connection()
     
+    def close(self) -> None:
+        """Close the primary connection and any pooled ones."""
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            finally:
+                self._connection = None
+        while True:
+            try:
+                conn, _ = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._pool_opened = 0
+
+    def __enter__(self) -> 'SetupConfig':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def validate(self) -> None:
         """Validate all configuration is present and correct."""
         validation = self.env_loader.validate_config()
@@ -138,8 +300,9 @@ class SetupConfig:
         
         print("✓ Configuration validated successfully")
     
+    @functools.lru_cache(maxsize=8)
     def get_substitutions(self, prefix: str) -> Dict[str, str]:
-        """Get variable substitutions for SQL templates."""
+        """Get variable substitutions for SQL templates (cached per prefix)."""
         return {
             "PREFIX": prefix,
             "SCHEMA": self.snowflake.schema_name,
@@ -149,7 +312,7 @@ class SetupConfig:
             "PREFIX_DATABASE": f"{prefix}_database",
             "SKYFLOW_VAULT_URL": self.skyflow.vault_url,
             "SKYFLOW_VAULT_ID": self.skyflow.vault_id,
-            "SKYFLOW_VAULT_HOST": self.skyflow.vault_url.replace('https://', '').replace('http://', ''),
+            "SKYFLOW_VAULT_HOST": self.skyflow.vault_host,
             "SKYFLOW_TABLE": self.skyflow.table,
             "SKYFLOW_TABLE_COLUMN": self.skyflow.table_column,
             "PLAIN_TEXT_GROUPS": self.groups.plain_text_groups,
@@ -159,4 +322,9 @@ class SetupConfig:
             "PREFIXED_PLAIN_TEXT_ROLE": f"{prefix}_{self.groups.plain_text_groups.upper()}".upper(),
             "PREFIXED_MASKED_ROLE": f"{prefix}_{self.groups.masked_groups.upper()}".upper(),
             "PREFIXED_REDACTED_ROLE": f"{prefix}_{self.groups.redacted_groups.upper()}".upper()
-        }
\ No newline at end of file
+        }
+
+@functools.lru_cache(maxsize=4)
+def _load_setup_config(path: str, mtime: Optional[float]) -> SetupConfig:
+    """Cache backend for SetupConfig.load (mtime is part of the key)."""
+    return SetupConfig(path)
@@ -8,49 +8,60 @@ from dotenv import load_dotenv
 
 class EnvLoader:
     """Loads and processes environment variables from .env.local file."""
-    
+
+    # Files already fed through load_dotenv in this process; dotenv
+    # parsing is pure disk/parse overhead the second time around.
+    _loaded = set()
+
     def __init__(self, env_file: str = ".env.local"):
         self.env_file = env_file
         self._load_env_file()
-    
+        # One snapshot serves every getter; os.getenv would redo the
+        # environment lookup per key per call.
+        self._env = dict(os.environ)
+
     def _load_env_file(self) -> None:
-        """Load environment file if it exists."""
+        """Load environment file if it exists (once per file per process)."""
         env_path = Path(self.env_file)
+        key = str(env_path.resolve())
+        if key in self._loaded:
+            return
         if env_path.exists():
             print(f"Loading configuration from {self.env_file}...")
             load_dotenv(env_path)
         else:
             print(f"Warning: {self.env_file} not found - using environment variables only")
+        self._loaded.add(key)
     
     def get_snowflake_config(self) -> Dict[str, Optional[str]]:
         """Extract Snowflake configuration from environment."""
         return {
-            "account": os.getenv("SNOWFLAKE_ACCOUNT"),
-            "user": os.getenv("SNOWFLAKE_USER"),
-            "password": os.getenv("SNOWFLAKE_PASSWORD"),
-            "pat_token": os.getenv("SNOWFLAKE_PAT_TOKEN"),
-            "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
-            "schema_name": os.getenv("SNOWFLAKE_SCHEMA", "PUBLIC"),
-            "role": os.getenv("SNOWFLAKE_ROLE")
+            "account": self._env.get("SNOWFLAKE_ACCOUNT"),
+            "user": self._env.get("SNOWFLAKE_USER"),
+            "password": self._env.get("SNOWFLAKE_PASSWORD"),
+            "pat_token": self._env.get("SNOWFLAKE_PAT_TOKEN"),
+            "warehouse": self._env.get("SNOWFLAKE_WAREHOUSE"),
+            "schema_name": self._env.get("SNOWFLAKE_SCHEMA", "PUBLIC"),
+            "role": self._env.get("SNOWFLAKE_ROLE")
         }
     
     def get_skyflow_config(self) -> Dict[str, Any]:
         """Extract Skyflow configuration from environment."""
         return {
-            "vault_url": os.getenv("SKYFLOW_VAULT_URL"),
-            "vault_id": os.getenv("SKYFLOW_VAULT_ID"),
-            "pat_token": os.getenv("SKYFLOW_PAT_TOKEN"),
-            "table": os.getenv("SKYFLOW_TABLE"),
-            "table_column": os.getenv("SKYFLOW_TABLE_COLUMN"),
-            "batch_size": int(os.getenv("SKYFLOW_BATCH_SIZE")) if os.getenv("SKYFLOW_BATCH_SIZE") else None
+            "vault_url": self._env.get("SKYFLOW_VAULT_URL"),
+            "vault_id": self._env.get("SKYFLOW_VAULT_ID"),
+            "pat_token": self._env.get("SKYFLOW_PAT_TOKEN"),
+            "table": self._env.get("SKYFLOW_TABLE"),
+            "table_column": self._env.get("SKYFLOW_TABLE_COLUMN"),
+            "batch_size": int(self._env["SKYFLOW_BATCH_SIZE"]) if self._env.get("SKYFLOW_BATCH_SIZE") else None
         }
     
     def get_group_mappings(self) -> Dict[str, str]:
         """Extract group mappings for detokenization."""
         return {
-            "plain_text_groups": os.getenv("PLAIN_TEXT_GROUPS"),
-            "masked_groups": os.getenv("MASKED_GROUPS"),
-            "redacted_groups": os.getenv("REDACTED_GROUPS")
+            "plain_text_groups": self._env.get("PLAIN_TEXT_GROUPS"),
+            "masked_groups": self._env.get("MASKED_GROUPS"),
+            "redacted_groups": self._env.get("REDACTED_GROUPS")
         }
     
     def validate_config(self) -> Dict[str, bool]:
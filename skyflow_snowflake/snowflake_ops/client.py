@@ -1,68 +1,173 @@
 """Snowflake connection wrapper with error handling."""
 
+import random
 import time
-from typing import Optional, Dict, Any
-import snowflake.connector
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from snowflake.connector.errors import Error as SnowflakeError
-from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from ..utils.logging import make_console
 
-console = Console()
+if TYPE_CHECKING:
+    import snowflake.connector
+
+console = make_console()
+
+
+def quote_ident(name: str) -> str:
+    """Quote one identifier part for safe SQL interpolation.
+
+    Unquoted identifiers resolve to their uppercase form, so the name
+    is uppercased before quoting - the quoted text then names the same
+    object the bare interpolation did, while embedded quotes and
+    reserved words stop being hazards. The canonical casing also keeps
+    the statement text stable for Snowflake's parse and result caches.
+    """
+    return '"' + name.upper().replace('"', '""') + '"'
+
+
+def quote_qualified(name: str) -> str:
+    """Quote each dot-separated part of a (possibly) qualified name."""
+    return '.'.join(quote_ident(part) for part in name.split('.'))
 
 
 class SnowflakeClientWrapper:
     """Enhanced Snowflake client with retry logic and better error handling."""
     
-    def __init__(self, connection: snowflake.connector.SnowflakeConnection):
+    def __init__(self, connection: 'snowflake.connector.SnowflakeConnection'):
         self.connection = connection
     
-    def wait_for_completion(self, operation_name: str, check_func, timeout: int = 300) -> bool:
-        """Wait for an operation to complete with progress indication."""
+    def wait_for_completion(self, operation_name: str, check_func=None, timeout: int = 300,
+                            query_id: Optional[str] = None) -> bool:
+        """Wait for an operation to complete with progress indication.
+
+        Polls with exponential backoff (50ms up to 2s) so sub-second
+        operations aren't stuck behind a fixed 2-second sleep. Pass an
+        async query_id to poll the connector's query status instead of
+        re-running a check query each iteration.
+        """
+        if query_id is not None and check_func is None:
+            def check_func():
+                status = self.connection.get_query_status(query_id)
+                if not self.connection.is_still_running(status):
+                    self.connection.get_query_status_throw_if_error(query_id)
+                    return True
+                return False
+
+        # Piped/CI output: skip the spinner (it runs a render thread and
+        # repaints at ~12 fps) and just log start and outcome.
+        if not console.is_terminal:
+            console.print(f"Waiting for {operation_name}...")
+            if self._poll(check_func, timeout):
+                console.print(f"✓ {operation_name} completed")
+                return True
+            console.print(f"✗ {operation_name} timed out")
+            return False
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
         ) as progress:
             task = progress.add_task(f"Waiting for {operation_name}...", total=None)
-            
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                try:
-                    if check_func():
-                        progress.update(task, description=f"✓ {operation_name} completed")
-                        return True
-                except Exception:
-                    pass  # Continue waiting
-                
-                time.sleep(2)
-            
+            if self._poll(check_func, timeout):
+                progress.update(task, description=f"✓ {operation_name} completed")
+                return True
             progress.update(task, description=f"✗ {operation_name} timed out")
             return False
+
+    @staticmethod
+    def _poll(check_func, timeout: int) -> bool:
+        """Run check_func with exponential backoff until true or timeout."""
+        sleep = 0.05
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            try:
+                if check_func():
+                    return True
+            except Exception:
+                pass  # Continue waiting
+
+            time.sleep(sleep)
+            sleep = min(sleep * 1.5, 2.0)
+        return False
     
     def execute_with_retry(self, operation, max_retries: int = 3, delay: int = 2) -> Any:
-        """Execute operation with retry logic."""
+        """Execute operation with retry logic.
+
+        Only transient errors are retried; permanent ones (duplicate
+        object, missing object, bad identifier, permissions) re-raise
+        immediately instead of sleeping through pointless backoff.
+        """
         last_error = None
         
         for attempt in range(max_retries):
             try:
                 return operation()
             except SnowflakeError as e:
+                if self._is_permanent(e):
+                    raise
                 last_error = e
                 if attempt < max_retries - 1:
                     console.print(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
-                    time.sleep(delay)
-                    delay *= 2  # Exponential backoff
+                    # Exponential backoff with jitter, capped at 30s
+                    time.sleep(min(delay, 30) * (1 + random.uniform(0, 0.1)))
+                    delay *= 2
                 else:
                     console.print(f"All {max_retries} attempts failed")
         
         raise last_error
     
+    # Snowflake error codes meaning "object does not exist".
+    _NOT_FOUND_ERRNOS = frozenset({2003, 2043, 90030})
+
+    # Error codes that no amount of retrying will fix: syntax error,
+    # object already exists, insufficient privileges, plus the
+    # not-found set above.
+    _PERMANENT_ERRNOS = frozenset({1003, 2002, 3001, 2003, 2043, 90030})
+
+    _PERMANENT_MARKERS = ('already exists', 'does not exist',
+                          'insufficient privileges', 'invalid identifier')
+
+    @classmethod
+    def _is_permanent(cls, e: SnowflakeError) -> bool:
+        """True when the error can't be cured by retrying."""
+        errno = getattr(e, 'errno', None)
+        if errno and errno in cls._PERMANENT_ERRNOS:
+            return True
+        message = str(e).lower()
+        return any(marker in message for marker in cls._PERMANENT_MARKERS)
+
+    def execute_script(self, cursor, statements) -> None:
+        """Run several statements as one multi-statement request.
+
+        All statements ride a single round trip; per-statement results
+        are drained so a failure in any of them raises. On failure the
+        statements replay one at a time, so the error that surfaces
+        belongs to the statement that actually broke.
+        """
+        if not statements:
+            return
+        script = ";\n".join(statements) + ";"
+        try:
+            cursor.execute(script, num_statements=len(statements))
+            while cursor.nextset():
+                pass
+        except SnowflakeError:
+            for statement in statements:
+                cursor.execute(statement)
+
     def check_resource_exists(self, resource_type: str, check_func) -> bool:
         """Check if a resource exists without throwing errors."""
         try:
             check_func()
             return True
         except SnowflakeError as e:
-            if "does not exist" in str(e) or "not found" in str(e).lower():
+            # Dispatch on the error code when the connector provides one;
+            # the substring scan is only a fallback for codeless errors.
+            errno = getattr(e, 'errno', None)
+            if errno:
+                if errno in self._NOT_FOUND_ERRNOS:
+                    return False
+            elif "does not exist" in str(e) or "not found" in str(e).lower():
                 return False
             raise  # Re-raise if it's not a "not found" error
\ No newline at end of file
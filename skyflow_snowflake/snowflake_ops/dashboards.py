@@ -1,23 +1,25 @@
 """Dashboard operations - Snowsight dashboard functionality for Skyflow integration."""
 
-import json
 from pathlib import Path
-from typing import Dict, Optional, Any
-import snowflake.connector
+from typing import Dict, Optional, Any, TYPE_CHECKING
+from snowflake.connector import DictCursor
 from snowflake.connector.errors import Error as SnowflakeError
-from rich.console import Console
+from ..utils.logging import make_console
 from .client import SnowflakeClientWrapper
 
-console = Console()
+if TYPE_CHECKING:
+    import snowflake.connector
+
+console = make_console()
 
 
 class SnowsightDashboardManager:
     """Manages Snowsight dashboards - simplified implementation."""
     
-    def __init__(self, connection: snowflake.connector.SnowflakeConnection):
+    def __init__(self, connection: 'snowflake.connector.SnowflakeConnection'):
         self.connection = connection
         self.wrapper = SnowflakeClientWrapper(connection)
-    
+
     def create_dashboard_from_file(self, local_path: str, dashboard_name: str, 
                                   warehouse_name: str, substitutions: Optional[Dict[str, str]] = None) -> Optional[str]:
         """Create a Snowsight dashboard (simplified - creates views instead)."""
@@ -37,16 +39,22 @@ class SnowsightDashboardManager:
                 f"CREATE OR REPLACE VIEW {dashboard_name}_TOKENIZATION_STATUS AS SELECT 'Tokenization Complete' as status, COUNT(*) as total_records FROM {substitutions.get('PREFIX', 'demo')}_customer_data"
             ]
             
-            cursor = self.connection.cursor()
-            
-            for view_sql in views:
-                try:
-                    cursor.execute(view_sql)
-                    console.print(f"  ✓ Created view: {view_sql.split()[4]}")  # Extract view name
-                except SnowflakeError as e:
-                    console.print(f"  ⚠ Failed to create view: {e}")
-            
-            cursor.close()
+            # One scripting block: the warehouse compiles and runs both
+            # view DDLs in a single RPC, and failure is atomic instead of
+            # leaving half a dashboard behind.
+            block_sql = "EXECUTE IMMEDIATE $$\nBEGIN\n" + \
+                "\n".join(f"  {view_sql};" for view_sql in views) + \
+                "\nEND;\n$$"
+            try:
+                with self.connection.cursor(DictCursor) as cursor:
+                    cursor.execute(block_sql)
+                    # One SHOW confirms what landed, instead of per-view
+                    # try/except bookkeeping.
+                    cursor.execute("SHOW VIEWS LIKE %s", (f"{dashboard_name}%",))
+                    for row in cursor:
+                        console.print(f"  ✓ Created view: {row['name']}")
+            except SnowflakeError as e:
+                console.print(f"  ⚠ Failed to create dashboard views: {e}")
             
             # Return a placeholder URL since we can't create actual Snowsight dashboards via API
             placeholder_url = f"https://app.snowflake.com/dashboards/{dashboard_name}"
@@ -76,12 +84,13 @@ class SnowsightDashboardManager:
         # Since we can't easily query Snowsight dashboards,
         # return a placeholder ID if views exist
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"SHOW VIEWS LIKE '{dashboard_name}%'")
-            views = cursor.fetchall()
-            cursor.close()
-            
-            if views:
+            with self.connection.cursor() as cursor:
+                # Client-side bind keeps the pattern out of the SQL text.
+                cursor.execute("SHOW VIEWS LIKE %s", (f"{dashboard_name}%",))
+                # One row is enough to answer "does it exist".
+                found = cursor.fetchone() is not None
+
+            if found:
                 return f"dashboard_{dashboard_name}"
             return None
         except:
@@ -91,21 +100,23 @@ class SnowsightDashboardManager:
         """Delete dashboard (simplified - drops related views)."""
         try:
             dashboard_name = dashboard_id.replace("dashboard_", "")
-            cursor = self.connection.cursor()
-            
-            # Drop views associated with the dashboard
-            cursor.execute(f"SHOW VIEWS LIKE '{dashboard_name}%'")
-            views = cursor.fetchall()
-            
-            for view in views:
-                view_name = view[1]  # View name is typically in the second column
-                try:
-                    cursor.execute(f"DROP VIEW IF EXISTS {view_name}")
-                    console.print(f"✓ Dropped view: {view_name}")
-                except SnowflakeError as e:
-                    console.print(f"⚠ Failed to drop view {view_name}: {e}")
-            
-            cursor.close()
+            with self.connection.cursor(DictCursor) as cursor:
+                # DictCursor keys rows by column name, so this survives
+                # SHOW VIEWS gaining or reordering columns; stream the
+                # rows straight into the name list.
+                cursor.execute("SHOW VIEWS LIKE %s", (f"{dashboard_name}%",))
+                view_names = [row['name'] for row in cursor]
+            if view_names:
+                # All DROPs ride one multi-statement request; IF EXISTS
+                # keeps a vanished view from failing the batch.
+                drops = [f"DROP VIEW IF EXISTS {name}" for name in view_names]
+                with self.connection.cursor() as cursor:
+                    try:
+                        self.wrapper.execute_script(cursor, drops)
+                        for name in view_names:
+                            console.print(f"✓ Dropped view: {name}")
+                    except SnowflakeError as e:
+                        console.print(f"⚠ Failed to drop dashboard views: {e}")
             console.print(f"✓ Dashboard components cleaned up: {dashboard_name}")
             return True
             
@@ -1,54 +1,42 @@
 """Stored procedure operations - Snowflake stored procedures for tokenization tasks."""
 
-import snowflake.connector
+from typing import TYPE_CHECKING
 from snowflake.connector.errors import Error as SnowflakeError
-from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from ..utils.logging import make_console
 from .client import SnowflakeClientWrapper
 
-console = Console()
+if TYPE_CHECKING:
+    import snowflake.connector
 
+console = make_console()
 
-class StoredProcedureManager:
-    """Manages Snowflake stored procedures for tokenization tasks."""
-    
-    def __init__(self, connection: snowflake.connector.SnowflakeConnection):
-        self.connection = connection
-        self.wrapper = SnowflakeClientWrapper(connection)
-    
-    def create_tokenization_procedure(self, prefix: str, substitutions: dict = None, batch_size: int = None) -> bool:
-        """Create Snowflake stored procedure using CTAS + SWAP approach for tokenization."""
-        try:
-            procedure_name = f"{prefix}_TOKENIZE_TABLE"
-            database_name = f"{prefix}_database"
-            
-            # Get substitution values
-            if substitutions is None:
-                substitutions = {}
-            
-            vault_host = substitutions.get('SKYFLOW_VAULT_HOST', 'unknown')
-            vault_id = substitutions.get('SKYFLOW_VAULT_ID', 'unknown') 
-            skyflow_table = substitutions.get('SKYFLOW_TABLE', 'pii')
-            table_column = substitutions.get('SKYFLOW_TABLE_COLUMN')
-            
-            # Create Python stored procedure using CTAS + SWAP approach
-            procedure_sql = f"""
+# Body of the tokenization procedure. Built once at import
+# time; the per-call pieces are applied with str.format. string.Template
+# is unsuitable here - it would treat the $$ body delimiters as escapes.
+_PROC_SQL_TEMPLATE = """
             CREATE OR REPLACE PROCEDURE {database_name}.PUBLIC.{procedure_name}()
             RETURNS STRING
             LANGUAGE PYTHON
             RUNTIME_VERSION = 3.12
-            HANDLER = 'ctas_swap_tokenize_handler'
+            HANDLER = 'tokenize_table_handler'
             EXTERNAL_ACCESS_INTEGRATIONS = ({prefix}_SKYFLOW_EXTERNAL_ACCESS_INTEGRATION)
             SECRETS = ('skyflow_pat_token' = SKYFLOW_PAT_TOKEN)
-            PACKAGES = ('requests', 'snowflake-snowpark-python')
+            PACKAGES = ('requests', 'snowflake-snowpark-python', 'orjson')
             AS
             $$
+import random
+import time
+import orjson
 import requests
+import requests.adapters
 import _snowflake
+from concurrent.futures import ThreadPoolExecutor
 from snowflake.snowpark import Session
 
-def ctas_swap_tokenize_handler(snowpark_session):
-    # CTAS + SWAP approach for Skyflow tokenization - clean, atomic, scalable
+def tokenize_table_handler(snowpark_session):
+    # Snapshot + staged-token approach for Skyflow tokenization; tokens
+    # are applied with one in-place UPDATE at the end
     
     try:
         # Get configuration
@@ -60,9 +48,7 @@ def ctas_swap_tokenize_handler(snowpark_session):
         
         # Table configuration
         source_table = '{prefix}_database.PUBLIC.{prefix}_customer_data'
-        snap_table = 'SNAP_CUSTOMER'  # temp table, unqualified
         staging_table = 'TOK_ALL'     # temp table, unqualified
-        new_table = '{prefix}_database.PUBLIC.{prefix}_customer_data_NEW'
         
         batch_size = {batch_size}
         
@@ -76,201 +62,270 @@ def ctas_swap_tokenize_handler(snowpark_session):
         
         # PII columns to tokenize
         pii_columns = ['first_name', 'last_name', 'email', 'phone_number', 'address', 'date_of_birth']
+
+        # SQL fragments derived from the column list, built once up front
+        # so every generated statement is byte-identical across
+        # invocations and eligible for Snowflake's plan cache
+        not_null_predicate = ' OR '.join([f'{{col}} IS NOT NULL' for col in pii_columns])
+        staging_cols_ddl = ', '.join([f'{{col}}_token STRING' for col in pii_columns])
+        update_set_clauses = ', '.join(
+            [f'{{col}} = COALESCE(stg.{{col}}_token, t.{{col}})' for col in pii_columns])
         
-        # Step 1: Create deterministic snapshot with row numbers (using TRANSIENT)
-        snapshot_sql = f\"\"\"
-        CREATE OR REPLACE TRANSIENT TABLE {{snap_table}} AS
-        SELECT 
-            ROW_NUMBER() OVER (ORDER BY customer_id, email, total_purchases, created_at) AS rn,
-            t.*
-        FROM {{source_table}} t
-        WHERE {{' OR '.join([f'{{col}} IS NOT NULL' for col in pii_columns])}}
-        \"\"\"
-        
-        snowpark_session.sql(snapshot_sql).collect()
-        
-        # Get total rows to process
-        count_df = snowpark_session.sql(f"SELECT COUNT(*) as count FROM {{snap_table}}")
-        total_rows = count_df.collect()[0]['COUNT']
-        
-        if total_rows == 0:
-            return "No rows to tokenize"
-        
-        # Step 2: Create staging table for tokens (using TRANSIENT)
-        staging_columns = ', '.join([f'{{col}}_token STRING' for col in pii_columns])
+        # Step 1: Create staging table for tokens, keyed by the table's
+        # customer_id surrogate key - no snapshot copy and no ROW_NUMBER
+        # sort; the key itself is the stable row identifier
         staging_sql = f\"\"\"
         CREATE OR REPLACE TRANSIENT TABLE {{staging_table}} (
-            rn NUMBER,
-            {{staging_columns}}
+            customer_id VARCHAR(50),
+            {{staging_cols_ddl}}
         )
         \"\"\"
-        
-        snowpark_session.sql(staging_sql).collect()
-        
-        # Step 3: Process each column's tokens by reading snapshot in rn order
+
+        stage_job = snowpark_session.sql(staging_sql).collect_nowait()
+
+        # Step 2: Row count runs while the staging DDL is in flight
+        count_df = snowpark_session.sql(f\"\"\"
+            SELECT COUNT(*) as count FROM {{source_table}}
+            WHERE {{not_null_predicate}}
+        \"\"\")
+        total_rows = count_df.collect()[0]['COUNT']
+
+        stage_job.result()
+
+        if total_rows == 0:
+            return "No rows to tokenize"
+
+        # Step 3: Tokenize all PII values. One source read serves every
+        # column, and values from different columns share batches, so
+        # sparse columns no longer pay for their own under-filled API
+        # calls. The Skyflow calls are independent, so a thread pool keeps
+        # several in flight; one Session with a sized adapter reuses HTTP
+        # connections across the workers.
         total_api_calls = 0
         total_tokens_processed = 0
-        
-        for col in pii_columns:
-            # Get all non-null values for this column in rn order
-            values_df = snowpark_session.sql(f\"\"\"
-                SELECT rn, {{col}} as pii_value
-                FROM {{snap_table}}
-                WHERE {{col}} IS NOT NULL AND TRIM({{col}}) != ''
-                ORDER BY rn
-            \"\"\")
-            
-            values_data = values_df.collect()
-            if not values_data:
-                continue
-                
-            # Tokenize in batches and collect all tokens
-            column_tokens = []  # List of (rn, token) tuples
-            
-            for batch_start in range(0, len(values_data), batch_size):
-                batch_end = min(batch_start + batch_size, len(values_data))
-                batch_data = values_data[batch_start:batch_end]
-                
-                # Prepare Skyflow API payload
-                skyflow_records = []
-                for row in batch_data:
-                    skyflow_records.append({{
-                        "fields": {{table_column: str(row['PII_VALUE'])}}
-                    }})
-                
-                # Call Skyflow API
-                payload = {{
-                    "records": skyflow_records,
-                    "tokenization": True
-                }}
-                
-                response = requests.post(tokenize_url, json=payload, headers=headers, timeout=30)
-                response.raise_for_status()
-                result = response.json()
-                
-                if not result or 'records' not in result:
-                    return f"Skyflow API error for {{col}}: " + str(result)[:200]
-                
-                # Extract tokens and pair with rn
-                for i, token_record in enumerate(result['records']):
-                    if i >= len(batch_data):
-                        break
-                        
-                    rn = batch_data[i]['RN']
-                    token = None
-                    
-                    # Extract token from response
-                    if 'tokens' in token_record and table_column in token_record['tokens']:
-                        token = token_record['tokens'][table_column]
-                    elif 'fields' in token_record and table_column in token_record['fields']:
-                        token = token_record['fields'][table_column]
-                    elif 'token' in token_record:
-                        token = token_record['token']
-                    elif table_column in token_record:
-                        token = token_record[table_column]
-                    
-                    if token:
-                        column_tokens.append((rn, token))
-                
-                total_api_calls += 1
-            
-            # Insert tokens for this column into staging table
-            if column_tokens:
-                # Build INSERT statement with token data
-                token_values = []
-                for rn, token in column_tokens:
-                    escaped_token = str(token).replace("'", "''")
-                    token_values.append(f"({{rn}}, '{{escaped_token}}')")
-                
-                if token_values:
-                    # Use MERGE to insert/update tokens by rn
-                    merge_sql = f\"\"\"
-                    MERGE INTO {{staging_table}} AS target
-                    USING (
-                        SELECT * FROM VALUES {{', '.join(token_values)}} AS t(rn, token)
-                    ) AS source
-                    ON target.rn = source.rn
-                    WHEN MATCHED THEN UPDATE SET {{col}}_token = source.token
-                    WHEN NOT MATCHED THEN INSERT (rn, {{col}}_token) VALUES (source.rn, source.token)
-                    \"\"\"
-                    
-                    snowpark_session.sql(merge_sql).collect()
-                    total_tokens_processed += len(column_tokens)
-        
-        # Step 4: Build new table with CTAS using COALESCE for token fallback
-        coalesce_columns = []
-        coalesce_columns.append('s.customer_id')
-        
+
+        # Retries are handled by post_with_retry below (with backoff and
+        # Retry-After support), so the adapter's own retry layer stays off
+        http = requests.Session()
+        http.mount("https://", requests.adapters.HTTPAdapter(
+            pool_connections=16, pool_maxsize=16, max_retries=0))
+
+        def post_with_retry(payload, max_attempts=5):
+            # Transient 429/5xx responses and network errors retry with
+            # bounded exponential backoff plus jitter; a 429 Retry-After
+            # header is honored when present. Anything else raises
+            for attempt in range(max_attempts):
+                try:
+                    response = http.post(tokenize_url, data=orjson.dumps(payload),
+                                         headers=headers, timeout=30)
+                    if response.status_code == 429 or response.status_code >= 500:
+                        if attempt == max_attempts - 1:
+                            response.raise_for_status()
+                        retry_after = response.headers.get('Retry-After')
+                        if retry_after is not None:
+                            delay = float(retry_after)
+                        else:
+                            delay = min(30, 2 ** attempt) + random.uniform(0, 1)
+                        time.sleep(delay)
+                        continue
+                    response.raise_for_status()
+                    return orjson.loads(response.content)
+                except requests.exceptions.RequestException:
+                    if attempt == max_attempts - 1:
+                        raise
+                    time.sleep(min(30, 2 ** attempt) + random.uniform(0, 1))
+
+        def tokenize_batch(chunk):
+            payload = {{
+                "records": [
+                    {{"fields": {{table_column: str(value)}}}}
+                    for _col, value in chunk
+                ],
+                "tokenization": True
+            }}
+            return post_with_retry(payload)
+
+        # Stream the source scan instead of materializing it; driver
+        # memory holds one seen-set of distinct values per column. The
+        # value-to-row fan-out happens SQL-side in the MERGE below, so
+        # Python never tracks which rows held which value
+        rows_iter = snowpark_session.sql(f\"\"\"
+            SELECT {{', '.join(pii_columns)}}
+            FROM {{source_table}}
+            WHERE {{not_null_predicate}}
+            ORDER BY customer_id
+        \"\"\").to_local_iterator()
+
+        # Deduplicate per column before calling Skyflow: repeated emails
+        # or phones tokenize once. entries holds unique (col, value)
+        # pairs in deterministic first-seen order
+        entries = []
+        seen_by_col = {{col: set() for col in pii_columns}}
+        col_keys = [(col, col.upper()) for col in pii_columns]
+        for row in rows_iter:
+            for col, col_key in col_keys:
+                value = row[col_key]
+                if value is None or str(value).strip() == '':
+                    continue
+                seen = seen_by_col[col]
+                if value not in seen:
+                    seen.add(value)
+                    entries.append((col, value))
+
+        # Pack entries into batches capped by record count and by
+        # approximate JSON size, so a run of long values can't push one
+        # request past the API payload limit
+        max_batch_bytes = 512 * 1024
+        chunks = []
+        current = []
+        current_bytes = 0
+        for entry in entries:
+            entry_bytes = len(str(entry[1])) + 64  # rough per-record envelope
+            if current and (len(current) >= batch_size or
+                            current_bytes + entry_bytes > max_batch_bytes):
+                chunks.append(current)
+                current = []
+                current_bytes = 0
+            current.append(entry)
+            current_bytes += entry_bytes
+        if current:
+            chunks.append(current)
+
+        tokens_by_col = {{col: [] for col in pii_columns}}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(tokenize_batch, chunks))
+
+        for chunk, result in zip(chunks, results):
+            total_api_calls += 1
+
+            if not result or 'records' not in result:
+                return "Skyflow API error: " + str(result)[:200]
+
+            # Demultiplex tokens back to every row holding the value
+            for (col, value), token_record in zip(chunk, result['records']):
+                token = None
+
+                # Extract token from response
+                if 'tokens' in token_record and table_column in token_record['tokens']:
+                    token = token_record['tokens'][table_column]
+                elif 'fields' in token_record and table_column in token_record['fields']:
+                    token = token_record['fields'][table_column]
+                elif 'token' in token_record:
+                    token = token_record['token']
+                elif table_column in token_record:
+                    token = token_record[table_column]
+
+                if token:
+                    tokens_by_col[col].append((value, token))
+
+        # One MERGE per column per batch_size slice. Only the distinct
+        # (value, token) pairs cross the wire as bind parameters; the
+        # join against the source table fans each token out to every
+        # matching row warehouse-side. Submitted without blocking and
+        # joined before the UPDATE; Snowflake serializes DML on the
+        # staging table itself, but submission overlaps
+        merge_jobs = []
         for col in pii_columns:
-            coalesce_columns.append(f'COALESCE(stg.{{col}}_token, s.{{col}}) AS {{col}}')
-        
-        # Add all other non-PII columns
-        other_columns = [
-            's.signup_date', 's.last_login', 's.total_purchases', 's.total_spent',
-            's.loyalty_status', 's.preferred_language', 's.consent_marketing', 
-            's.consent_data_sharing', 's.created_at', 's.updated_at'
-        ]
-        coalesce_columns.extend(other_columns)
-        
-        ctas_sql = f\"\"\"
-        CREATE OR REPLACE TABLE {{new_table}} AS
-        SELECT
-            {{',\\n            '.join(coalesce_columns)}}
-        FROM {{snap_table}} s
-        LEFT JOIN {{staging_table}} stg USING (rn)
+            column_tokens = tokens_by_col[col]
+            for start in range(0, len(column_tokens), batch_size):
+                slice_tokens = column_tokens[start:start + batch_size]
+
+                placeholders = ', '.join(['(?, ?)'] * len(slice_tokens))
+                params = []
+                for value, token in slice_tokens:
+                    params.extend((str(value), str(token)))
+
+                merge_sql = f\"\"\"
+                MERGE INTO {{staging_table}} AS target
+                USING (
+                    SELECT s.customer_id, vt.token
+                    FROM {{source_table}} s
+                    JOIN (SELECT * FROM VALUES {{placeholders}} AS v(val, token)) vt
+                      ON s.{{col}} = vt.val
+                ) AS source
+                ON target.customer_id = source.customer_id
+                WHEN MATCHED THEN UPDATE SET {{col}}_token = source.token
+                WHEN NOT MATCHED THEN INSERT (customer_id, {{col}}_token) VALUES (source.customer_id, source.token)
+                \"\"\"
+
+                merge_jobs.append(
+                    snowpark_session.sql(merge_sql, params=params).collect_nowait())
+                total_tokens_processed += len(slice_tokens)
+
+        # Barrier: the UPDATE below must see every token
+        for job in merge_jobs:
+            job.result()
+
+        # Step 4: Apply tokens in place. UPDATE ... FROM rewrites only
+        # the micro-partitions that actually hold tokenized rows instead
+        # of rebuilding the whole table through CTAS + SWAP, so wide
+        # non-PII columns are not copied; a single UPDATE is still atomic
+        update_sql = f\"\"\"
+        UPDATE {{source_table}} t
+        SET {{update_set_clauses}}
+        FROM {{staging_table}} stg
+        WHERE t.customer_id = stg.customer_id
         \"\"\"
-        
-        snowpark_session.sql(ctas_sql).collect()
-        
-        # Step 5: Validation before SWAP
-        validation_df = snowpark_session.sql(f\"\"\"
-        SELECT 
-            (SELECT COUNT(*) FROM {{source_table}}) AS old_rows,
-            (SELECT COUNT(*) FROM {{new_table}}) AS new_rows
-        \"\"\")
-        
-        validation_result = validation_df.collect()[0]
-        old_rows = validation_result['OLD_ROWS']
-        new_rows = validation_result['NEW_ROWS']
-        
-        if old_rows != new_rows:
-            return f"Validation failed: row count mismatch ({{old_rows}} -> {{new_rows}})"
-        
-        # Step 6: Atomic SWAP
-        swap_sql = f\"ALTER TABLE {{source_table}} SWAP WITH {{new_table}}\"
-        snowpark_session.sql(swap_sql).collect()
-        
-        # Step 7: Drop the _NEW table (which now contains original plain-text data)
-        try:
-            snowpark_session.sql(f\"DROP TABLE IF EXISTS {{new_table}}\").collect()
-        except Exception:
-            pass  # Ignore cleanup errors
-        
-        # Step 8: Cleanup transient tables
+
+        snowpark_session.sql(update_sql).collect()
+
+        # Step 5: Cleanup the staging table
         try:
-            snowpark_session.sql(f\"DROP TABLE IF EXISTS {{snap_table}}\").collect()
             snowpark_session.sql(f\"DROP TABLE IF EXISTS {{staging_table}}\").collect()
         except Exception:
             pass  # Ignore cleanup errors
         
-        return f"CTAS+SWAP tokenization complete: {{total_tokens_processed}} tokens via {{total_api_calls}} API calls ({{new_rows}} total rows)"
+        return f"Tokenization complete: {{total_tokens_processed}} tokens via {{total_api_calls}} API calls ({{total_rows}} rows scanned)"
         
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
-        return f"CTAS+SWAP tokenization failed: {{str(e)}} - Details: {{error_details[:500]}}"
+        return f"Tokenization failed: {{str(e)}} - Details: {{error_details[:500]}}"
 $$
             """
+
+
+class StoredProcedureManager:
+    """Manages Snowflake stored procedures for tokenization tasks."""
+    
+    def __init__(self, connection: 'snowflake.connector.SnowflakeConnection'):
+        self.connection = connection
+        self.wrapper = SnowflakeClientWrapper(connection)
+    
+    def create_tokenization_procedure(self, prefix: str, substitutions: dict = None, batch_size: int = None) -> bool:
+        """Create the Snowflake stored procedure that tokenizes the customer table."""
+        try:
+            procedure_name = f"{prefix}_TOKENIZE_TABLE"
+            database_name = f"{prefix}_database"
+            
+            # Get substitution values
+            if substitutions is None:
+                substitutions = {}
+            
+            vault_host = substitutions.get('SKYFLOW_VAULT_HOST', 'unknown')
+            vault_id = substitutions.get('SKYFLOW_VAULT_ID', 'unknown') 
+            skyflow_table = substitutions.get('SKYFLOW_TABLE', 'pii')
+            table_column = substitutions.get('SKYFLOW_TABLE_COLUMN')
+            
+            procedure_sql = _PROC_SQL_TEMPLATE.format(
+                database_name=database_name,
+                procedure_name=procedure_name,
+                prefix=prefix,
+                vault_host=vault_host,
+                vault_id=vault_id,
+                skyflow_table=skyflow_table,
+                table_column=table_column,
+                batch_size=batch_size,
+            )
             
             cursor = self.connection.cursor()
             
             def create_proc():
                 cursor.execute(procedure_sql)
-                return cursor.fetchall()
             
             self.wrapper.execute_with_retry(create_proc)
             cursor.close()
-            console.print(f"✓ Created CTAS+SWAP tokenization procedure: {procedure_name}")
+            console.print(f"✓ Created tokenization procedure: {procedure_name}")
             return True
             
         except SnowflakeError as e:
@@ -278,7 +333,7 @@ $$
             return False
     
     def execute_tokenization_procedure(self, prefix: str) -> bool:
-        """Execute the CTAS+SWAP tokenization stored procedure synchronously (blocking)."""
+        """Execute the tokenization stored procedure synchronously (blocking)."""
         try:
             database_name = f"{prefix}_database"
             procedure_name = f"{database_name}.PUBLIC.{prefix}_TOKENIZE_TABLE"
@@ -286,9 +341,9 @@ $$
             cursor = self.connection.cursor()
             
             # Execute synchronously and wait for completion
-            console.print(f"🚀 Starting CTAS+SWAP tokenization procedure: {procedure_name}")
+            console.print(f"🚀 Starting tokenization procedure: {procedure_name}")
             with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
-                task = progress.add_task("Tokenizing data with CTAS+SWAP approach...", total=None)
+                task = progress.add_task("Tokenizing data...", total=None)
                 
                 cursor.execute(f"CALL {procedure_name}()")
                 result = cursor.fetchone()
@@ -298,7 +353,7 @@ $$
             cursor.close()
             
             if result and result[0]:
-                console.print(f"✓ CTAS+SWAP tokenization completed successfully")
+                console.print(f"✓ Tokenization completed successfully")
                 console.print(f"📋 Result: {result[0]}")
             else:
                 console.print("⚠ Tokenization completed but no result returned")
@@ -334,7 +389,6 @@ $$
                 prefix = procedure_name.split('_TOKENIZE_TABLE')[0] if '_TOKENIZE_TABLE' in procedure_name else procedure_name
                 database_name = f"{prefix}_database"
                 cursor.execute(f"DROP PROCEDURE IF EXISTS {database_name}.PUBLIC.{procedure_name}()")
-                return cursor.fetchall()
             
             self.wrapper.execute_with_retry(drop_proc)
             cursor.close()
@@ -1,48 +1,63 @@
 """Secrets management - Snowflake secrets functionality for Skyflow integration."""
 
-from typing import Dict, List
-import snowflake.connector
+from typing import Dict, List, TYPE_CHECKING
 from snowflake.connector.errors import Error as SnowflakeError
-from rich.console import Console
-from .client import SnowflakeClientWrapper
+from ..utils.logging import make_console
+from .client import SnowflakeClientWrapper, quote_ident
 
-console = Console()
+if TYPE_CHECKING:
+    import snowflake.connector
+
+console = make_console()
 
 
 class SnowflakeSecretsManager:
     """Manages Snowflake secrets for external function authentication."""
     
-    def __init__(self, connection: snowflake.connector.SnowflakeConnection):
+    def __init__(self, connection: 'snowflake.connector.SnowflakeConnection'):
         self.connection = connection
         self.wrapper = SnowflakeClientWrapper(connection)
-    
+        # Uppercased names from one SHOW SECRETS, shared by all existence
+        # checks in this manager; None until first use
+        self._secret_names = None
+
+    def _list_secret_names(self, force: bool = False) -> set:
+        """Secret names visible to the session, fetched once and cached."""
+        if force or self._secret_names is None:
+            try:
+                with self.connection.cursor() as cursor:
+                    cursor.execute("SHOW SECRETS")
+                    # Iterate the cursor directly; fetchall would buffer
+                    # every SHOW row just to throw the list away.
+                    self._secret_names = {row[1].upper() for row in cursor}
+            except SnowflakeError:
+                self._secret_names = set()
+        return self._secret_names
+
     def create_secret(self, secret_name: str, secret_value: str, comment: str = None) -> bool:
         """Create a Snowflake secret object."""
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if secret already exists
-            cursor.execute(f"SHOW SECRETS LIKE '{secret_name}'")
-            if cursor.fetchone():
+            # Check if secret already exists (cached set, no extra SHOW)
+            if secret_name.upper() in self._list_secret_names():
                 console.print(f"✓ Secret '{secret_name}' already exists")
-                cursor.close()
                 return True
-            
-            # Create secret
-            comment_clause = f"COMMENT = '{comment}'" if comment else ""
-            create_sql = f"""
-            CREATE SECRET {secret_name}
-            TYPE = GENERIC_STRING
-            SECRET_STRING = '{secret_value}'
-            {comment_clause}
-            """
-            
-            def create_secret_obj():
-                cursor.execute(create_sql)
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(create_secret_obj)
-            cursor.close()
+
+            # Create secret. The value (and comment) go through parameter
+            # binding so embedded quotes can't break the statement; the
+            # name is generated internally and stays an identifier.
+            create_sql = f"CREATE SECRET {quote_ident(secret_name)} TYPE = GENERIC_STRING SECRET_STRING = %s"
+            params = [secret_value]
+            if comment:
+                create_sql += " COMMENT = %s"
+                params.append(comment)
+
+            with self.connection.cursor() as cursor:
+                def create_secret_obj():
+                    cursor.execute(create_sql, params)
+
+                self.wrapper.execute_with_retry(create_secret_obj)
+            if self._secret_names is not None:
+                self._secret_names.add(secret_name.upper())
             console.print(f"✓ Created secret: {secret_name}")
             return True
             
@@ -53,14 +68,11 @@ class SnowflakeSecretsManager:
     def alter_secret(self, secret_name: str, new_value: str) -> bool:
         """Update an existing Snowflake secret."""
         try:
-            cursor = self.connection.cursor()
-            
-            def alter_secret_obj():
-                cursor.execute(f"ALTER SECRET {secret_name} SET SECRET_STRING = '{new_value}'")
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(alter_secret_obj)
-            cursor.close()
+            with self.connection.cursor() as cursor:
+                def alter_secret_obj():
+                    cursor.execute(f"ALTER SECRET {quote_ident(secret_name)} SET SECRET_STRING = %s", (new_value,))
+
+                self.wrapper.execute_with_retry(alter_secret_obj)
             console.print(f"✓ Updated secret: {secret_name}")
             return True
             
@@ -71,40 +83,62 @@ class SnowflakeSecretsManager:
     def drop_secret(self, secret_name: str, database_name: str = None) -> bool:
         """Drop a Snowflake secret."""
         try:
-            cursor = self.connection.cursor()
-            
-            # If database name provided, use qualified name to avoid database context issues
+            # DROP SECRET IF EXISTS handles the missing-secret case, so no
+            # SHOW precheck round trip; use the qualified name to avoid
+            # database context issues
             if database_name:
-                qualified_name = f"{database_name}.PUBLIC.{secret_name}"
-                try:
-                    cursor.execute(f"SHOW SECRETS LIKE '{secret_name}' IN DATABASE {database_name}")
-                except SnowflakeError:
-                    # Database might not exist, secret doesn't exist
-                    console.print(f"✓ Secret '{secret_name}' doesn't exist")
-                    cursor.close()
-                    return True
+                qualified_name = f"{quote_ident(database_name)}.PUBLIC.{quote_ident(secret_name)}"
             else:
-                qualified_name = secret_name
-                cursor.execute(f"SHOW SECRETS LIKE '{secret_name}'")
-            
-            if not cursor.fetchone():
-                console.print(f"✓ Secret '{secret_name}' doesn't exist")
-                cursor.close()
-                return True
-            
-            def drop_secret_obj():
-                cursor.execute(f"DROP SECRET IF EXISTS {qualified_name}")
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(drop_secret_obj)
-            cursor.close()
+                qualified_name = quote_ident(secret_name)
+
+            with self.connection.cursor() as cursor:
+                def drop_secret_obj():
+                    cursor.execute(f"DROP SECRET IF EXISTS {qualified_name}")
+
+                self.wrapper.execute_with_retry(drop_secret_obj)
+            if self._secret_names is not None:
+                self._secret_names.discard(secret_name.upper())
             console.print(f"✓ Dropped secret: {secret_name}")
             return True
             
         except SnowflakeError as e:
+            # A missing parent database means the secret is already gone
+            if "does not exist" in str(e) or "not found" in str(e).lower():
+                console.print(f"✓ Secret '{secret_name}' doesn't exist")
+                return True
             console.print(f"✗ Failed to drop secret {secret_name}: {e}")
             return False
     
+    def drop_secrets_batch(self, secret_names: List[str], database_name: str = None) -> bool:
+        """Drop several secrets in one multi-statement round trip.
+
+        DROP SECRET IF EXISTS makes the per-secret SHOW precheck
+        unnecessary, so the whole cleanup is a single request regardless
+        of how many secrets there are.
+        """
+        if not secret_names:
+            return True
+        try:
+            if database_name:
+                db_id = quote_ident(database_name)
+                qualified = [f"{db_id}.PUBLIC.{quote_ident(name)}" for name in secret_names]
+            else:
+                qualified = [quote_ident(name) for name in secret_names]
+            drops = [f"DROP SECRET IF EXISTS {name}" for name in qualified]
+
+            with self.connection.cursor() as cursor:
+                self.wrapper.execute_with_retry(
+                    lambda: self.wrapper.execute_script(cursor, drops))
+            if self._secret_names is not None:
+                for name in secret_names:
+                    self._secret_names.discard(name.upper())
+            console.print(f"✓ Dropped secrets: {', '.join(secret_names)}")
+            return True
+
+        except SnowflakeError as e:
+            console.print(f"✗ Failed to drop secrets {', '.join(secret_names)}: {e}")
+            return False
+
     def setup_skyflow_secrets(self, skyflow_config: Dict[str, str]) -> bool:
         """Setup only the sensitive Skyflow secret (PAT token)."""
         # Only create secret for the sensitive PAT token
@@ -120,25 +154,27 @@ class SnowflakeSecretsManager:
         
         return success
     
-    def list_secrets(self, pattern: str = None) -> List[str]:
-        """List all secrets, optionally filtered by pattern."""
+    def list_secrets(self, pattern: str = None) -> frozenset:
+        """Secret names, optionally filtered by pattern.
+
+        Built straight off the cursor in one pass - no fetchall buffer,
+        no intermediate list - and returned as a frozenset since every
+        caller wants membership, not order.
+        """
         try:
-            cursor = self.connection.cursor()
-            if pattern:
-                cursor.execute(f"SHOW SECRETS LIKE '{pattern}'")
-            else:
-                cursor.execute("SHOW SECRETS")
-            
-            results = cursor.fetchall()
-            cursor.close()
-            return [row[1] for row in results] if results else []  # Second column is the secret name
+            with self.connection.cursor() as cursor:
+                if pattern:
+                    cursor.execute("SHOW SECRETS LIKE %s", (pattern,))
+                else:
+                    cursor.execute("SHOW SECRETS")
+                return frozenset(row[1] for row in cursor)  # Second column is the secret name
         except SnowflakeError:
-            return []
+            return frozenset()
     
     def verify_secrets(self, required_secrets: List[str]) -> bool:
         """Verify that all required secrets exist."""
-        existing_secrets = self.list_secrets()
-        missing_secrets = [secret for secret in required_secrets if secret not in existing_secrets]
+        existing_secrets = self._list_secret_names()
+        missing_secrets = sorted({secret.upper() for secret in required_secrets} - existing_secrets)
         
         if missing_secrets:
             console.print(f"✗ Missing secrets: {', '.join(missing_secrets)}")
@@ -148,12 +184,5 @@ class SnowflakeSecretsManager:
         return True
     
     def secret_exists(self, secret_name: str) -> bool:
-        """Check if a secret exists."""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"SHOW SECRETS LIKE '{secret_name}'")
-            exists = cursor.fetchone() is not None
-            cursor.close()
-            return exists
-        except SnowflakeError:
-            return False
\ No newline at end of file
+        """Check if a secret exists (answered from the cached name set)."""
+        return secret_name.upper() in self._list_secret_names()
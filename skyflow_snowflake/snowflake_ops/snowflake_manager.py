@@ -1,77 +1,90 @@
 """Snowflake database and schema operations - Snowflake resource management for Skyflow integration."""
 
-from typing import Dict, Optional, List
-import snowflake.connector
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, List, TYPE_CHECKING
 from snowflake.connector.errors import Error as SnowflakeError
-from rich.console import Console
-from .client import SnowflakeClientWrapper
+from ..utils.logging import make_console
+from .client import SnowflakeClientWrapper, quote_ident
 
-console = Console()
+if TYPE_CHECKING:
+    import snowflake.connector
+
+console = make_console()
+
+# Serializes output from role tasks running on worker threads
+_print_lock = threading.Lock()
+
+
+class ResourceSnapshot:
+    """Which integration resources currently exist for a prefix."""
+
+    __slots__ = ("database", "roles", "api_integration")
+
+    def __init__(self, database: bool, roles: set, api_integration: bool):
+        self.database = database
+        self.roles = roles
+        self.api_integration = api_integration
+
+    @property
+    def empty(self) -> bool:
+        """True when nothing exists and a destroy pass can be skipped."""
+        return not (self.database or self.roles or self.api_integration)
 
 
 class SnowflakeResourceManager:
     """Manages Snowflake database, schema, and external function resources for Skyflow integration."""
     
-    def __init__(self, connection: snowflake.connector.SnowflakeConnection):
+    def __init__(self, connection: 'snowflake.connector.SnowflakeConnection'):
         self.connection = connection
         self.wrapper = SnowflakeClientWrapper(connection)
     
-    def create_api_integration(self, name: str, api_provider: str, api_key_secret: str) -> bool:
-        """Create Snowflake API integration for external functions."""
+    def create_api_integration(self, name: str, api_provider: str, api_key_secret: str,
+                               recreate: bool = False) -> bool:
+        """Create Snowflake API integration for external functions.
+
+        One CREATE does the work; an existing integration surfaces as an
+        "already exists" error treated as success, so there is no SHOW
+        precheck round trip. Pass recreate=True to rebuild it in place.
+        """
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if integration already exists
-            cursor.execute(f"SHOW API INTEGRATIONS LIKE '{name}'")
-            if cursor.fetchone():
-                console.print(f"✓ API integration '{name}' already exists")
-                cursor.close()
-                return True
-            
-            # Create API integration
+            verb = "CREATE OR REPLACE" if recreate else "CREATE"
             create_sql = f"""
-            CREATE OR REPLACE API INTEGRATION {name}
+            {verb} API INTEGRATION {quote_ident(name)}
             API_PROVIDER = {api_provider}
             API_KEY = '{api_key_secret}'
             ENABLED = TRUE
             """
-            
-            def create_integration():
-                cursor.execute(create_sql)
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(create_integration)
-            cursor.close()
+
+            with self.connection.cursor() as cursor:
+                def create_integration():
+                    cursor.execute(create_sql)
+
+                self.wrapper.execute_with_retry(create_integration)
             console.print(f"✓ Created API integration: {name}")
             return True
             
         except SnowflakeError as e:
+            if "already exists" in str(e).lower():
+                console.print(f"✓ API integration '{name}' already exists")
+                return True
             console.print(f"✗ Failed to create API integration {name}: {e}")
             return False
     
     def create_database(self, name: str, comment: Optional[str] = None) -> bool:
         """Create Snowflake database."""
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if database already exists
-            cursor.execute(f"SHOW DATABASES LIKE '{name}'")
-            if cursor.fetchone():
-                console.print(f"✓ Database '{name}' already exists")
-                cursor.close()
-                return True
-            
-            # Create database
+            # IF NOT EXISTS folds the existence precheck into the CREATE
+            # itself - one round trip either way.
             comment_clause = f"COMMENT = '{comment or f'Skyflow integration database - {name}'}'"
-            create_sql = f"CREATE DATABASE {name} {comment_clause}"
-            
-            def create_db():
-                cursor.execute(create_sql)
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(create_db)
-            cursor.close()
-            console.print(f"✓ Created database: {name}")
+            create_sql = f"CREATE DATABASE IF NOT EXISTS {quote_ident(name)} {comment_clause}"
+
+            with self.connection.cursor() as cursor:
+                def create_db():
+                    cursor.execute(create_sql)
+
+                self.wrapper.execute_with_retry(create_db)
+            console.print(f"✓ Database ready: {name}")
             return True
             
         except SnowflakeError as e:
@@ -81,59 +94,68 @@ class SnowflakeResourceManager:
     def create_schema(self, database_name: str, schema_name: str = "PUBLIC") -> bool:
         """Create schema in Snowflake database."""
         try:
-            cursor = self.connection.cursor()
-            
-            # Switch to the database
-            cursor.execute(f"USE DATABASE {database_name}")
-            
-            # Check if schema already exists
-            cursor.execute(f"SHOW SCHEMAS LIKE '{schema_name}'")
-            if cursor.fetchone():
-                console.print(f"✓ Schema '{database_name}.{schema_name}' already exists")
-                cursor.close()
-                return True
-            
-            # Create schema
-            def create_sch():
-                cursor.execute(f"CREATE SCHEMA {schema_name}")
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(create_sch)
-            cursor.close()
-            console.print(f"✓ Created schema: {database_name}.{schema_name}")
+            # Fully qualified name replaces the USE DATABASE hop, and
+            # IF NOT EXISTS replaces the SHOW precheck.
+            with self.connection.cursor() as cursor:
+                def create_sch():
+                    cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {quote_ident(database_name)}.{quote_ident(schema_name)}")
+
+                self.wrapper.execute_with_retry(create_sch)
+            console.print(f"✓ Schema ready: {database_name}.{schema_name}")
             return True
             
         except SnowflakeError as e:
             console.print(f"✗ Failed to create schema {database_name}.{schema_name}: {e}")
             return False
     
+    def create_database_and_schema(self, database_name: str, schema_name: str = "PUBLIC",
+                                   comment: Optional[str] = None) -> bool:
+        """Create a database and its schema in a single round trip.
+
+        IF NOT EXISTS makes the existence prechecks unnecessary, and both
+        DDLs ride one multi-statement request instead of two compile and
+        queue cycles.
+        """
+        try:
+            comment_clause = f"COMMENT = '{comment or f'Skyflow integration database - {database_name}'}'"
+            db_id, schema_id = quote_ident(database_name), quote_ident(schema_name)
+            # The USE rides the same request: later steps (secrets,
+            # network rules) issue unqualified schema-level DDL and rely
+            # on the session's current database being set here.
+            statements = [
+                f"CREATE DATABASE IF NOT EXISTS {db_id} {comment_clause}",
+                f"CREATE SCHEMA IF NOT EXISTS {db_id}.{schema_id}",
+                f"USE DATABASE {db_id}",
+            ]
+
+            with self.connection.cursor() as cursor:
+                self.wrapper.execute_with_retry(
+                    lambda: self.wrapper.execute_script(cursor, statements))
+            console.print(f"✓ Database and schema ready: {database_name}.{schema_name}")
+            return True
+
+        except SnowflakeError as e:
+            console.print(f"✗ Failed to create {database_name}.{schema_name}: {e}")
+            return False
+
     def create_role(self, role_name: str, comment: Optional[str] = None) -> bool:
         """Create Snowflake role if it doesn't exist."""
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if role already exists
-            cursor.execute(f"SHOW ROLES LIKE '{role_name}'")
-            if cursor.fetchone():
-                console.print(f"✓ Role '{role_name}' already exists")
-                cursor.close()
-                return True
-            
-            # Create role
             comment_clause = f"COMMENT = '{comment or f'Role for Skyflow integration - {role_name}'}'"
-            create_sql = f"CREATE ROLE {role_name} {comment_clause}"
-            
-            def create_role_obj():
-                cursor.execute(create_sql)
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(create_role_obj)
-            cursor.close()
-            console.print(f"✓ Created role: {role_name}")
+            create_sql = f"CREATE ROLE IF NOT EXISTS {quote_ident(role_name)} {comment_clause}"
+
+            with self.connection.cursor() as cursor:
+                def create_role_obj():
+                    cursor.execute(create_sql)
+
+                self.wrapper.execute_with_retry(create_role_obj)
+            with _print_lock:
+                console.print(f"✓ Role ready: {role_name}")
             return True
             
         except SnowflakeError as e:
-            console.print(f"✗ Failed to create role {role_name}: {e}")
+            with _print_lock:
+                console.print(f"✗ Failed to create role {role_name}: {e}")
             return False
     
     def create_required_roles(self, roles: List[str], group_config=None) -> bool:
@@ -141,22 +163,27 @@ class SnowflakeResourceManager:
         success = True
         
         console.print(f"Creating {len(roles)} required roles...")
-        
-        for role_name in roles:
+
+        def comment_for(role_name: str) -> str:
             # Determine role type from role name to provide appropriate description
-            comment = f'Role for {role_name}'  # Default
-            
             if group_config:
                 role_upper = role_name.upper()
                 if group_config.plain_text_groups.upper() in role_upper:
-                    comment = 'Users who can see detokenized (plain text) PII data'
-                elif group_config.masked_groups.upper() in role_upper:
-                    comment = 'Users who see masked/redacted PII data'  
-                elif group_config.redacted_groups.upper() in role_upper:
-                    comment = 'Users who only see tokenized PII data'
-            
-            if not self.create_role(role_name, comment):
-                success = False
+                    return 'Users who can see detokenized (plain text) PII data'
+                if group_config.masked_groups.upper() in role_upper:
+                    return 'Users who see masked/redacted PII data'
+                if group_config.redacted_groups.upper() in role_upper:
+                    return 'Users who only see tokenized PII data'
+            return f'Role for {role_name}'  # Default
+
+        # Role creations are independent; fan them out so N roles cost
+        # roughly one round trip instead of N. Each task owns its cursor
+        with ThreadPoolExecutor(max_workers=min(8, len(roles) or 1)) as pool:
+            futures = [pool.submit(self.create_role, name, comment_for(name))
+                       for name in roles]
+            for future in as_completed(futures):
+                if not future.result():
+                    success = False
         
         if success:
             console.print("✓ All required roles created successfully")
@@ -170,29 +197,38 @@ class SnowflakeResourceManager:
     def _grant_roles_to_current_user(self, roles: List[str]) -> bool:
         """Grant roles to current user so they appear in Snowflake UI."""
         try:
-            cursor = self.connection.cursor()
-            current_user = None
-            
-            # Get current user
-            cursor.execute("SELECT CURRENT_USER()")
-            result = cursor.fetchone()
-            if result:
-                current_user = result[0]
-            
-            if not current_user:
-                console.print("⚠ Could not determine current user for role grants")
-                return False
-            
-            # Grant each role to current user
-            for role_name in roles:
+            with self.connection.cursor() as cursor:
+                current_user = None
+
+                # Get current user
+                cursor.execute("SELECT CURRENT_USER()")
+                result = cursor.fetchone()
+                if result:
+                    current_user = result[0]
+
+                if not current_user:
+                    console.print("⚠ Could not determine current user for role grants")
+                    return False
+
+                # All grants ride one multi-statement request; fall back
+                # to per-role grants only if the batch fails, so a single
+                # bad role still gets pinpointed.
+                user_id = quote_ident(current_user)
+                batch_sql = ";\n".join(
+                    f"GRANT ROLE {quote_ident(role_name)} TO USER {user_id}" for role_name in roles) + ";"
                 try:
-                    grant_sql = f"GRANT ROLE {role_name} TO USER {current_user}"
-                    cursor.execute(grant_sql)
-                    console.print(f"  ✓ Granted {role_name} to {current_user}")
-                except Exception as e:
-                    console.print(f"  ⚠ Failed to grant {role_name} to {current_user}: {e}")
-            
-            cursor.close()
+                    cursor.execute(batch_sql, num_statements=len(roles))
+                    while cursor.nextset():
+                        pass  # Drain per-statement results; errors raise
+                    for role_name in roles:
+                        console.print(f"  ✓ Granted {role_name} to {current_user}")
+                except Exception:
+                    for role_name in roles:
+                        try:
+                            cursor.execute(f"GRANT ROLE {quote_ident(role_name)} TO USER {user_id}")
+                            console.print(f"  ✓ Granted {role_name} to {current_user}")
+                        except Exception as e:
+                            console.print(f"  ⚠ Failed to grant {role_name} to {current_user}: {e}")
             return True
             
         except Exception as e:
@@ -201,72 +237,57 @@ class SnowflakeResourceManager:
     
     def grant_database_access_to_roles(self, database_name: str, roles: List[str]) -> bool:
         """Grant database access to the created roles."""
-        try:
-            cursor = self.connection.cursor()
-            success = True
-            
-            console.print(f"Granting database access to {len(roles)} roles...")
-            
-            for role_name in roles:
-                try:
-                    # Grant USAGE on database
-                    def grant_usage():
-                        cursor.execute(f"GRANT USAGE ON DATABASE {database_name} TO ROLE {role_name}")
-                        return cursor.fetchall()
-                    
-                    self.wrapper.execute_with_retry(grant_usage)
-                    
-                    # Grant USAGE on schema
-                    def grant_schema_usage():
-                        cursor.execute(f"GRANT USAGE ON SCHEMA {database_name}.PUBLIC TO ROLE {role_name}")
-                        return cursor.fetchall()
-                    
-                    self.wrapper.execute_with_retry(grant_schema_usage)
-                    
-                    # Grant SELECT on tables (for querying data)
-                    def grant_select():
-                        cursor.execute(f"GRANT SELECT ON ALL TABLES IN SCHEMA {database_name}.PUBLIC TO ROLE {role_name}")
-                        return cursor.fetchall()
-                    
-                    self.wrapper.execute_with_retry(grant_select)
-                    
+        console.print(f"Granting database access to {len(roles)} roles...")
+
+        def grant_role(role_name: str) -> bool:
+            # Each task owns its cursor; the three grants ride one
+            # multi-statement request
+            db_id, role_id = quote_ident(database_name), quote_ident(role_name)
+            grants = [
+                f"GRANT USAGE ON DATABASE {db_id} TO ROLE {role_id}",
+                f"GRANT USAGE ON SCHEMA {db_id}.PUBLIC TO ROLE {role_id}",
+                f"GRANT SELECT ON ALL TABLES IN SCHEMA {db_id}.PUBLIC TO ROLE {role_id}",
+            ]
+            try:
+                with self.connection.cursor() as cursor:
+                    self.wrapper.execute_with_retry(
+                        lambda: self.wrapper.execute_script(cursor, grants))
+                with _print_lock:
                     console.print(f"  ✓ Granted access to role: {role_name}")
-                    
-                except SnowflakeError as e:
+                return True
+            except SnowflakeError as e:
+                with _print_lock:
                     console.print(f"  ✗ Failed to grant access to role {role_name}: {e}")
+                return False
+
+        # Grants for different roles are independent; overlap them
+        success = True
+        with ThreadPoolExecutor(max_workers=min(8, len(roles) or 1)) as pool:
+            for granted in pool.map(grant_role, roles):
+                if not granted:
                     success = False
-            
-            cursor.close()
-            
-            if success:
-                console.print("✓ Database access granted to all roles")
-            
-            return success
-            
-        except SnowflakeError as e:
-            console.print(f"✗ Failed to grant database access: {e}")
-            return False
+
+        if success:
+            console.print("✓ Database access granted to all roles")
+
+        return success
     
     def drop_database(self, name: str, cascade: bool = True) -> bool:
         """Drop Snowflake database and all contents."""
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if database exists
-            cursor.execute(f"SHOW DATABASES LIKE '{name}'")
-            if not cursor.fetchone():
-                console.print(f"✓ Database '{name}' doesn't exist")
-                cursor.close()
-                return True
-            
-            # Drop database
-            cascade_clause = "CASCADE" if cascade else ""
-            def drop_db():
-                cursor.execute(f"DROP DATABASE {name} {cascade_clause}")
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(drop_db)
-            cursor.close()
+            with self.connection.cursor() as cursor:
+                # Check if database exists
+                cursor.execute(f"SHOW DATABASES LIKE '{name}'")
+                if not cursor.fetchone():
+                    console.print(f"✓ Database '{name}' doesn't exist")
+                    return True
+
+                # Drop database
+                cascade_clause = "CASCADE" if cascade else ""
+                def drop_db():
+                    cursor.execute(f"DROP DATABASE {quote_ident(name)} {cascade_clause}")
+
+                self.wrapper.execute_with_retry(drop_db)
             console.print(f"✓ Dropped database: {name}")
             return True
             
@@ -277,21 +298,17 @@ class SnowflakeResourceManager:
     def drop_api_integration(self, name: str) -> bool:
         """Drop Snowflake API integration."""
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if integration exists
-            cursor.execute(f"SHOW API INTEGRATIONS LIKE '{name}'")
-            if not cursor.fetchone():
-                console.print(f"✓ API integration '{name}' doesn't exist")
-                cursor.close()
-                return True
-            
-            def drop_integration():
-                cursor.execute(f"DROP API INTEGRATION {name}")
-                return cursor.fetchall()
-            
-            self.wrapper.execute_with_retry(drop_integration)
-            cursor.close()
+            with self.connection.cursor() as cursor:
+                # Check if integration exists
+                cursor.execute(f"SHOW API INTEGRATIONS LIKE '{name}'")
+                if not cursor.fetchone():
+                    console.print(f"✓ API integration '{name}' doesn't exist")
+                    return True
+
+                def drop_integration():
+                    cursor.execute(f"DROP API INTEGRATION {quote_ident(name)}")
+
+                self.wrapper.execute_with_retry(drop_integration)
             console.print(f"✓ Dropped API integration: {name}")
             return True
             
@@ -312,24 +329,42 @@ class SnowflakeResourceManager:
         
         return success
     
+    def snapshot_existing(self, prefix: str, role_names: List[str]) -> ResourceSnapshot:
+        """Probe which integration resources already exist for a prefix.
+
+        Three SHOW queries replace a full destroy pass on greenfield
+        installs; the snapshot drives a selective destroy of only the
+        resources that are actually present.
+        """
+        database = self.database_exists(f"{prefix}_database")
+
+        expected = {name.upper() for name in role_names}
+        roles = set()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"SHOW ROLES LIKE '{prefix.upper()}_%'")
+                roles = {row[1] for row in cursor.fetchall()} & expected
+        except SnowflakeError:
+            pass
+
+        api_integration = self.api_integration_exists("SKYFLOW_API_INTEGRATION")
+        return ResourceSnapshot(database=database, roles=roles,
+                                api_integration=api_integration)
+
     def database_exists(self, name: str) -> bool:
         """Check if a database exists."""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"SHOW DATABASES LIKE '{name}'")
-            exists = cursor.fetchone() is not None
-            cursor.close()
-            return exists
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"SHOW DATABASES LIKE '{name}'")
+                return cursor.fetchone() is not None
         except SnowflakeError:
             return False
     
     def api_integration_exists(self, name: str) -> bool:
         """Check if an API integration exists."""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"SHOW API INTEGRATIONS LIKE '{name}'")
-            exists = cursor.fetchone() is not None
-            cursor.close()
-            return exists
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"SHOW API INTEGRATIONS LIKE '{name}'")
+                return cursor.fetchone() is not None
         except SnowflakeError:
             return False
\ No newline at end of file
@@ -1,137 +1,370 @@
 """SQL execution - Snowflake SQL execution functionality for Skyflow integration."""
 
+import csv
+import functools
+import re
+import sys
 import time
 from pathlib import Path
-from typing import Dict, Optional, List, Any, Tuple
-import snowflake.connector
+from typing import Dict, Iterable, Iterator, Optional, List, Any, Tuple, TYPE_CHECKING
 from snowflake.connector.errors import Error as SnowflakeError
-from rich.console import Console
-from rich.table import Table
-from .client import SnowflakeClientWrapper
+from ..utils.logging import make_console
+from .client import SnowflakeClientWrapper, quote_qualified
 
-console = Console()
+if TYPE_CHECKING:
+    import snowflake.connector
+
+console = make_console()
+
+# Resolved once; every relative SQL file path is looked up under here.
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+@functools.lru_cache(maxsize=64)
+def _load_sql_template(path: str, mtime_ns: int) -> str:
+    """Read a SQL template from disk (cached; mtime is part of the key)."""
+    with open(path, 'r') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=16)
+def _substitution_pattern(keys: frozenset) -> 're.Pattern':
+    """Compiled ${KEY} matcher for a substitution key set (cached)."""
+    alternation = "|".join(map(re.escape, sorted(keys)))
+    return re.compile(r"\$\{(" + alternation + r")\}")
+
+
+def _iter_statements(sql: str) -> Iterator[str]:
+    """Yield statements from SQL text, splitting on ';' in one O(n) pass.
+
+    A small state machine tracks quoted literals, $$...$$ bodies, and
+    -- line comments, so semicolons inside any of them never split a
+    statement. Whitespace-only fragments are swallowed.
+    """
+    buf = []
+    i = 0
+    n = len(sql)
+    in_single = in_double = in_dollar = in_comment = False
+    while i < n:
+        ch = sql[i]
+        if in_comment:
+            if ch == '\n':
+                in_comment = False
+        elif in_single:
+            if ch == "'":
+                in_single = False
+        elif in_double:
+            if ch == '"':
+                in_double = False
+        elif in_dollar:
+            if ch == '$' and sql.startswith('$$', i):
+                buf.append('$$')
+                in_dollar = False
+                i += 2
+                continue
+        else:
+            if ch == ';':
+                statement = ''.join(buf)
+                if statement.strip():
+                    yield statement
+                buf = []
+                i += 1
+                continue
+            if ch == "'":
+                in_single = True
+            elif ch == '"':
+                in_double = True
+            elif ch == '$' and sql.startswith('$$', i):
+                buf.append('$$')
+                in_dollar = True
+                i += 2
+                continue
+            elif ch == '-' and sql.startswith('--', i):
+                in_comment = True
+        buf.append(ch)
+        i += 1
+    tail = ''.join(buf)
+    if tail.strip():
+        yield tail
+
+
+# Strips whole-line -- comments; applied before any whitespace handling.
+_COMMENT_RE = re.compile(r"^\s*--.*$", re.MULTILINE)
+
+_WS_RE = re.compile(r"\s+")
+
+# Detects a $$...$$ body holding Python code, whose formatting must
+# survive cleaning untouched.
+_PY_UDF_RE = re.compile(r"\$\$.*?^\s*(?:def |import ).*?\$\$", re.DOTALL | re.MULTILINE)
+
+
+def _strip_line_comment(line: str) -> str:
+    """Drop a trailing -- comment from one line, honoring quoted literals.
+
+    Inline comments must go before a statement is collapsed onto one
+    line, or the first -- would comment out everything after it.
+    """
+    in_single = in_double = False
+    i = 0
+    n = len(line)
+    while i < n:
+        ch = line[i]
+        if in_single:
+            if ch == "'":
+                in_single = False
+        elif in_double:
+            if ch == '"':
+                in_double = False
+        elif ch == "'":
+            in_single = True
+        elif ch == '"':
+            in_double = True
+        elif ch == '-' and line.startswith('--', i):
+            return line[:i]
+        i += 1
+    return line
+
+
+def _clean_statements(raw_statements: Iterable[str]) -> List[str]:
+    """Extract executable SQL from raw statement chunks (comments stripped)."""
+    statements = []
+    for stmt in raw_statements:
+        if _PY_UDF_RE.search(stmt):
+            # Embedded Python body: indentation is significant, so only
+            # drop whole comment lines and the blanks they leave behind.
+            cleaned = _COMMENT_RE.sub('', stmt)
+            cleaned = '\n'.join(
+                line.rstrip() for line in cleaned.split('\n') if line.strip())
+        else:
+            # Plain SQL: strip inline comments per line, then collapse
+            # all whitespace in one pass.
+            cleaned = _WS_RE.sub(
+                ' ', '\n'.join(map(_strip_line_comment, stmt.split('\n')))).strip()
+        if cleaned:
+            statements.append(cleaned)
+    return statements
+
+
+@functools.lru_cache(maxsize=64)
+def _render_statements(path: str, mtime_ns: int, subs_items: tuple) -> tuple:
+    """Render a SQL template into its statement list (cached per file+subs)."""
+    sql_content = _load_sql_template(path, mtime_ns)
+    if subs_items:
+        subs = dict(subs_items)
+        pattern = _substitution_pattern(frozenset(subs))
+        sql_content = pattern.sub(lambda m: str(subs[m.group(1)]), sql_content)
+    return tuple(_clean_statements(_iter_statements(sql_content)))
 
 
 class SnowflakeSQLExecutor:
     """Executes SQL files and statements against Snowflake."""
     
-    def __init__(self, connection: snowflake.connector.SnowflakeConnection):
+    def __init__(self, connection: 'snowflake.connector.SnowflakeConnection'):
         self.connection = connection
         self.wrapper = SnowflakeClientWrapper(connection)
+        # Catalog object names per "<scope>.<kind>" key, each populated by
+        # one SHOW per scope. Invalidated whenever a DDL statement runs
+        # through this executor.
+        self._catalog_cache: Dict[str, set] = {}
     
     def apply_substitutions(self, sql: str, substitutions: Dict[str, str]) -> str:
-        """Apply variable substitutions to SQL content."""
+        """Apply variable substitutions to SQL content.
+
+        One compiled-regex pass replaces every ${KEY} at once instead of
+        re-scanning the whole string per key.
+        """
         if not substitutions:
             return sql
-        
-        for key, value in substitutions.items():
-            sql = sql.replace(f"${{{key}}}", str(value))
-        
-        return sql
+
+        pattern = _substitution_pattern(frozenset(substitutions))
+        return pattern.sub(lambda m: str(substitutions[m.group(1)]), sql)
     
-    def execute_statement(self, sql: str) -> Optional[Tuple[List[Any], List[str]]]:
-        """Execute a single SQL statement and return results and column names."""
+    def execute_statement(self, sql: str, cursor=None) -> Optional[Tuple[List[Any], List[str]]]:
+        """Execute a single SQL statement and return results and column names.
+
+        Pass a cursor to reuse it across several statements; otherwise a
+        one-shot cursor is opened and closed here.
+        """
         try:
-            cursor = self.connection.cursor()
-            
-            def execute():
-                cursor.execute(sql)
-                results = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                return results, columns
-            
-            results, columns = self.wrapper.execute_with_retry(execute)
-            cursor.close()
-            return results, columns
-                
+            if cursor is None:
+                with self.connection.cursor() as owned:
+                    return self._run_statement(owned, sql)
+            return self._run_statement(cursor, sql)
+
         except SnowflakeError as e:
             console.print(f"✗ SQL execution error: {e}")
             return None
+
+    def _run_statement(self, cursor, sql: str) -> Tuple[List[Any], List[str]]:
+        """Execute sql on cursor with retries; returns results and columns."""
+        def execute():
+            cursor.execute(sql)
+            results = cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description] if cursor.description else []
+            return results, columns
+
+        results, columns = self.wrapper.execute_with_retry(execute)
+        if self._catalog_cache and self._DDL_RE.match(sql):
+            self.invalidate()
+        return results, columns
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """Drop cached catalog listings (all of them, or one object kind)."""
+        if kind is None:
+            self._catalog_cache.clear()
+        else:
+            suffix = f".{kind.upper()}"
+            for key in [k for k in self._catalog_cache if k.endswith(suffix)]:
+                del self._catalog_cache[key]
+
+    def _catalog_names(self, kind: str, scope: str, cursor=None) -> Optional[set]:
+        """Object names of one kind in one scope, fetched once per scope.
+
+        A single SHOW lists the whole scope and later lookups are set
+        membership, instead of one SHOW ... LIKE round trip per object.
+        Returns None (uncached) when the listing itself fails.
+        """
+        key = f"{scope}.{kind}"
+        names = self._catalog_cache.get(key)
+        if names is None:
+            show_sql = f"SHOW {kind} IN SCHEMA {quote_qualified(scope)}" if scope else f"SHOW {kind}"
+            result = self.execute_statement(show_sql, cursor=cursor)
+            if result is None:
+                return None
+            # SHOW puts the object name in the second column.
+            names = {row[1].upper() for row in result[0]}
+            self._catalog_cache[key] = names
+        return names
     
-    def execute_sql_file(self, file_path: str, substitutions: Optional[Dict[str, str]] = None) -> bool:
-        """Execute SQL from a file with variable substitutions."""
+    def render(self, file_path: str, substitutions: Optional[Dict[str, str]] = None) -> Optional[List[str]]:
+        """Render a SQL file into its statement list.
+
+        Results are cached per (file, mtime, substitutions) so repeated
+        executions - e.g. create's destroy-first pass followed by setup -
+        skip the disk read, templating, and statement splitting.
+        """
         # If path is relative, look in templates directory
-        if not Path(file_path).is_absolute():
-            template_dir = Path(__file__).parent.parent / "templates"
-            path = template_dir / file_path
-        else:
-            path = Path(file_path)
-        
-        if not path.exists():
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = TEMPLATE_DIR / file_path
+
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
             console.print(f"✗ SQL file not found: {path}")
+            return None
+
+        subs_items = tuple(sorted(substitutions.items())) if substitutions else ()
+        return list(_render_statements(str(path), mtime_ns, subs_items))
+
+    # Statements safe to overlap: they create independent objects and don't
+    # touch session state. Everything else (GRANT, USE, DROP, ALTER,
+    # CREATE TABLE, CREATE FUNCTION, CREATE EXTERNAL ACCESS INTEGRATION)
+    # runs serially, acting as a barrier for any in-flight async
+    # statements - so objects referenced by a later statement always
+    # exist before it runs. CREATE FUNCTION is deliberately excluded:
+    # Snowflake validates a SQL UDF body at creation time, and the setup
+    # templates define UDFs that call UDFs created earlier in the same
+    # file, so those statements must not overlap.
+    _INDEPENDENT_RE = re.compile(
+        r'^\s*CREATE\s+(OR\s+REPLACE\s+)?(SECURE\s+)?(EXTERNAL\s+)?'
+        r'(NETWORK\s+RULE|MASKING\s+POLICY|ROLE|DATABASE|SECRET)\b',
+        re.IGNORECASE,
+    )
+
+    # Cap on concurrently running async statements per file.
+    _MAX_ASYNC = 4
+
+    # Statements that can change what exists; they invalidate cached
+    # existence checks.
+    _DDL_RE = re.compile(r'^\s*(CREATE|DROP|ALTER)\b', re.IGNORECASE)
+
+    def execute_sql_file(self, file_path: str, substitutions: Optional[Dict[str, str]] = None) -> bool:
+        """Execute SQL from a file with variable substitutions.
+
+        Independent CREATE FUNCTION / CREATE NETWORK RULE statements are
+        submitted with execute_async and overlapped (at most _MAX_ASYNC in
+        flight); order-sensitive statements wait for all pending async
+        work first, preserving the file's serial semantics for them.
+        """
+        statements = self.render(file_path, substitutions)
+        if statements is None:
             return False
-        
-        console.print(f"Executing SQL file: {path.name}")
-        
+
+        console.print(f"Executing SQL file: {Path(file_path).name}")
+
+        pending = []  # (index, query_id) of submitted async statements
+
+        def drain() -> bool:
+            """Wait for all pending async statements; report failures."""
+            ok = True
+            while pending:
+                still_pending = []
+                for idx, qid in pending:
+                    status = self.connection.get_query_status(qid)
+                    if self.connection.is_still_running(status):
+                        still_pending.append((idx, qid))
+                        continue
+                    try:
+                        self.connection.get_query_status_throw_if_error(qid)
+                        console.print(f"  ✓ Statement {idx+1} completed")
+                    except SnowflakeError as e:
+                        console.print(f"✗ Failed to execute statement {idx+1}: {e}")
+                        ok = False
+                pending[:] = still_pending
+                if pending:
+                    time.sleep(0.1)
+            return ok
+
         try:
-            with open(path, 'r') as f:
-                sql_content = f.read()
-            
-            # Apply substitutions
-            if substitutions:
-                sql_content = self.apply_substitutions(sql_content, substitutions)
-            
-            # Split into individual statements and extract SQL from mixed comment/SQL parts
-            raw_statements = sql_content.split(';')
-            statements = []
-            for stmt in raw_statements:
-                cleaned = stmt.strip()
-                if not cleaned or len(cleaned) <= 2:
-                    continue
-                    
-                # Check if this contains Python code (preserve original formatting)
-                if '$$' in cleaned and ('def ' in cleaned or 'import ' in cleaned):
-                    # This is a Python function block - preserve original formatting
-                    lines = cleaned.split('\n')
-                    sql_lines = []
-                    for line in lines:
-                        # Only skip pure comment lines, preserve Python code indentation
-                        if line.strip() and not line.strip().startswith('--'):
-                            sql_lines.append(line.rstrip())  # Keep original indentation, remove trailing spaces
-                    
-                    if sql_lines:
-                        sql_statement = '\n'.join(sql_lines)
-                        if len(sql_statement.strip()) > 2:
-                            statements.append(sql_statement)
-                else:
-                    # Regular SQL - process line by line and clean up
-                    lines = cleaned.split('\n')
-                    sql_lines = []
-                    for line in lines:
-                        line = line.strip()
-                        # Skip empty lines and comment-only lines
-                        if line and not line.startswith('--'):
-                            sql_lines.append(line)
-                    
-                    # If we found actual SQL content, preserve formatting for Python functions
-                    if sql_lines:
-                        # For multi-line statements, preserve line breaks
-                        # For single-line statements, join with spaces for better readability
-                        if len(sql_lines) > 3:  # Multi-line statement, preserve formatting
-                            sql_statement = '\n'.join(sql_lines).strip()
-                        else:  # Single-line statement, join with spaces
-                            sql_statement = ' '.join(sql_lines).strip()
-                        
-                        if len(sql_statement) > 2:
-                            statements.append(sql_statement)
-            
             success = True
             for i, statement in enumerate(statements):
+                if self._INDEPENDENT_RE.match(statement):
+                    while len(pending) >= self._MAX_ASYNC:
+                        if not drain():
+                            success = False
+                    if not success:
+                        break
+                    console.print(f"  Executing statement {i+1}/{len(statements)} (async)")
+                    cursor = self.connection.cursor()
+                    try:
+                        cursor.execute_async(statement)
+                        pending.append((i, cursor.sfqid))
+                    finally:
+                        cursor.close()
+                    # Async statements bypass _run_statement, so drop the
+                    # catalog cache here too. Invalidating at submission
+                    # (rather than completion) is the conservative side:
+                    # the listing is refetched no earlier than it would
+                    # be made stale.
+                    if self._catalog_cache and self._DDL_RE.match(statement):
+                        self.invalidate()
+                    continue
+
+                # Order-sensitive statement: barrier on all async work first
+                if not drain():
+                    success = False
+                if not success:
+                    break
+
                 console.print(f"  Executing statement {i+1}/{len(statements)}")
                 result = self.execute_statement(statement)
-                
+
                 if result is None:
                     success = False
                     console.print(f"✗ Failed to execute statement {i+1}")
                     break
                 else:
                     console.print(f"  ✓ Statement {i+1} completed")
-            
+
+            if not drain():
+                success = False
+
             if success:
-                console.print(f"✓ Successfully executed {path.name}")
-            
+                console.print(f"✓ Successfully executed {Path(file_path).name}")
+
             return success
-            
+
         except Exception as e:
             console.print(f"✗ Error reading/executing {file_path}: {e}")
             return False
@@ -143,59 +376,34 @@ class SnowflakeSQLExecutor:
         if result:
             results_data, columns = result
             if results_data and columns:
-                # Convert to list of dictionaries
-                results = []
-                
-                for row in results_data[:max_rows]:
-                    row_dict = {columns[i]: row[i] for i in range(len(columns))} if columns else {}
-                    results.append(row_dict)
-                
-                return results
+                # zip pairs each row with the column names directly -
+                # no per-cell index arithmetic.
+                cols = tuple(columns)
+                return [dict(zip(cols, row)) for row in results_data[:max_rows]]
         
         return None
     
-    def verify_table_exists(self, table_name: str) -> bool:
-        """Check if a table exists."""
+    def verify_table_exists(self, table_name: str, cursor=None) -> bool:
+        """Check if a table exists (served from the cached catalog listing)."""
         try:
-            # Parse table name to get parts
-            parts = table_name.split('.')
-            if len(parts) == 3:
-                database, schema, table = parts
-                sql = f"SHOW TABLES LIKE '{table}' IN SCHEMA {database}.{schema}"
-            elif len(parts) == 2:
-                schema, table = parts
-                sql = f"SHOW TABLES LIKE '{table}' IN SCHEMA {schema}"
-            else:
-                table = parts[0]
-                sql = f"SHOW TABLES LIKE '{table}'"
-            
-            result = self.execute_statement(sql)
-            return result is not None and len(result[0]) > 0
+            scope, _, table = table_name.rpartition('.')
+            names = self._catalog_names('TABLES', scope, cursor=cursor)
+            return names is not None and table.upper() in names
         except:
             return False
     
-    def verify_function_exists(self, function_name: str) -> bool:
-        """Check if a function exists."""
+    def verify_function_exists(self, function_name: str, cursor=None) -> bool:
+        """Check if a function exists (served from the cached catalog listing)."""
         try:
-            parts = function_name.split('.')
-            if len(parts) == 3:
-                database, schema, func = parts
-                sql = f"SHOW FUNCTIONS LIKE '{func}' IN SCHEMA {database}.{schema}"
-            elif len(parts) == 2:
-                schema, func = parts
-                sql = f"SHOW FUNCTIONS LIKE '{func}' IN SCHEMA {schema}"
-            else:
-                func = parts[0]
-                sql = f"SHOW FUNCTIONS LIKE '{func}'"
-            
-            result = self.execute_statement(sql)
-            return result is not None and len(result[0]) > 0
+            scope, _, func = function_name.rpartition('.')
+            names = self._catalog_names('FUNCTIONS', scope, cursor=cursor)
+            return names is not None and func.upper() in names
         except:
             return False
     
     def get_table_row_count(self, table_name: str) -> Optional[int]:
         """Get row count for a table."""
-        sql = f"SELECT COUNT(*) as count FROM {table_name}"
+        sql = f"SELECT COUNT(*) as count FROM {quote_qualified(table_name)}"
         results = self.execute_query_with_results(sql)
         
         if results and len(results) > 0:
@@ -207,21 +415,27 @@ class SnowflakeSQLExecutor:
     
     def show_table_sample(self, table_name: str, limit: int = 5) -> None:
         """Display a sample of table data."""
-        sql = f"SELECT * FROM {table_name} LIMIT {limit}"
+        sql = f"SELECT * FROM {quote_qualified(table_name)} LIMIT {limit}"
         results = self.execute_query_with_results(sql, max_rows=limit)
         
-        if results:
-            table = Table(title=f"Sample data from {table_name}")
-            
-            # Add columns
-            if results:
-                for column in results[0].keys():
-                    table.add_column(column)
-                
-                # Add rows
-                for row in results:
-                    table.add_row(*[str(value) for value in row.values()])
-            
-            console.print(table)
-        else:
-            console.print(f"No data found in {table_name}")
\ No newline at end of file
+        if not results:
+            console.print(f"No data found in {table_name}")
+            return
+
+        # Piped output or big samples: plain CSV streams the rows out
+        # instead of Rich measuring and padding every cell.
+        if not console.is_terminal or len(results) > 50:
+            writer = csv.writer(sys.stdout)
+            writer.writerow(results[0].keys())
+            for row in results:
+                writer.writerow(row.values())
+            return
+
+        from rich.table import Table  # Deferred: only this path renders one
+
+        table = Table(title=f"Sample data from {table_name}")
+        for column in results[0].keys():
+            table.add_column(column)
+        for row in results:
+            table.add_row(*map(str, row.values()))
+        console.print(table)
\ No newline at end of file
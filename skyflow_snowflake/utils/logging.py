@@ -2,24 +2,49 @@
 
 import logging
 import sys
-from rich.logging import RichHandler
 from rich.console import Console
 
 console = Console()
 
 
+def make_console() -> Console:
+    """Build a Console for module-level status output.
+
+    Interactive runs get the full Rich console. Piped/CI runs get one
+    with markup parsing, syntax highlighting, emoji substitution, and
+    line wrapping switched off - plain lines are all a log file needs,
+    and skipping that rendering keeps bulk setup output cheap.
+    """
+    if sys.stdout.isatty():
+        return Console()
+    return Console(no_color=True, highlight=False, markup=False,
+                   emoji=False, soft_wrap=True)
+
+
 def setup_logging(level: str = "INFO") -> logging.Logger:
     """Setup logging with Rich handler for beautiful output."""
     
     # Convert string level to logging constant
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     
+    # Piped/CI output: a plain StreamHandler writes the line and is
+    # done, instead of RichHandler formatting ANSI nobody will see.
+    if not sys.stdout.isatty():
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+    else:
+        # Deferred: rich.logging drags in traceback machinery that
+        # piped/CI runs never use.
+        from rich.logging import RichHandler
+        handler = RichHandler(console=console, rich_tracebacks=True,
+                              log_time_format="[%X]")
+
     # Configure logging
     logging.basicConfig(
         level=numeric_level,
         format="%(message)s",
         datefmt="[%X]",
-        handlers=[RichHandler(console=console, rich_tracebacks=True)]
+        handlers=[handler]
     )
     
-    return logging.getLogger("skyflow_setup")
\ No newline at end of file
+    return logging.getLogger("skyflow_setup")
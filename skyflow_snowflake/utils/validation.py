@@ -1,35 +1,71 @@
 """Input validation utilities."""
 
-import re
+import functools
+import os
+import string
+import sys
+from pathlib import Path
 from typing import List, Tuple, Optional
 
+# Resolved once at import; every required-file check looks under here.
+# Kept as a plain string: the existence checks below are os.path based,
+# and building a Path object per file costs more than the check itself.
+_TEMPLATE_DIR = str(Path(__file__).resolve().parent.parent / "templates")
+
+# Characters a warehouse ID may contain; membership is one hashed
+# lookup per character instead of a regex walk.
+_WAREHOUSE_ALLOWED = frozenset(string.ascii_letters + string.digits + "-_")
+
+# Names a prefix may never take; built once, checked by hash. The
+# entries are interned so a hit can short-circuit on pointer identity.
+_RESERVED_PREFIXES = frozenset(sys.intern(s) for s in (
+    'system', 'information_schema', 'public', 'snowflake', 'util_db'))
+
 
 def validate_prefix(prefix: str) -> Tuple[bool, Optional[str]]:
     """Validate prefix name meets Snowflake naming requirements."""
     if not prefix:
         return False, "Prefix cannot be empty"
     
-    if not re.match(r'^[a-zA-Z][a-zA-Z0-9_]*$', prefix):
-        return False, "Prefix must start with a letter and contain only letters, numbers, and underscores"
-    
+    # O(1) gates first, so an oversized or obviously bad input is
+    # rejected before any full scan of the string.
     if len(prefix) > 50:
         return False, "Prefix cannot be longer than 50 characters"
     
-    # Reserved keywords
-    reserved = ['system', 'information_schema', 'public', 'snowflake', 'util_db']
-    if prefix.lower() in reserved:
+    first = prefix[0]
+    if not ('a' <= first <= 'z' or 'A' <= first <= 'Z'):
+        return False, "Prefix must start with a letter and contain only letters, numbers, and underscores"
+    
+    # Same grammar as the old ^[a-zA-Z][a-zA-Z0-9_]*$ pattern:
+    # isidentifier handles letters/digits/underscores and isascii
+    # rules out Unicode letters - both C string scans. The leading
+    # character is already known to be an ASCII letter.
+    if not (prefix.isascii() and prefix.isidentifier()):
+        return False, "Prefix must start with a letter and contain only letters, numbers, and underscores"
+    
+    if prefix.lower() in _RESERVED_PREFIXES:
         return False, f"Prefix '{prefix}' is reserved and cannot be used"
     
     return True, None
 
 
+def validate_prefixes(prefixes: List[str]) -> List[Tuple[bool, Optional[str]]]:
+    """Validate several prefixes at once, one result per input, in order.
+
+    The validator is bound as a local so the loop skips the module
+    global lookup per element.
+    """
+    check = validate_prefix
+    return [check(prefix) for prefix in prefixes]
+
+
 def validate_warehouse_id(warehouse_id: str) -> Tuple[bool, Optional[str]]:
     """Validate warehouse ID format."""
     if not warehouse_id:
         return False, "Warehouse ID cannot be empty"
     
     # Basic format validation - Snowflake warehouse names are alphanumeric with underscores
-    if not re.match(r'^[a-zA-Z0-9\-_]{10,}$', warehouse_id):
+    if len(warehouse_id) < 10 or any(c not in _WAREHOUSE_ALLOWED for c in warehouse_id):
         return False, "Warehouse ID format appears invalid"
     
     return True, None
@@ -40,25 +76,58 @@ def validate_url(url: str, name: str = "URL") -> Tuple[bool, Optional[str]]:
     if not url:
         return False, f"{name} cannot be empty"
     
-    if not re.match(r'^https?://', url):
+    # A fixed-prefix test needs no regex engine.
+    if not url.startswith(('http://', 'https://')):
         return False, f"{name} must start with http:// or https://"
     
     return True, None
 
 
+@functools.lru_cache(maxsize=64)
+def _dir_listing(parent: str) -> frozenset:
+    """Names present in one template directory, listed once per process.
+
+    Shipped templates don't change while the CLI runs, so repeated
+    validation passes (re-runs, multi-command flows) skip the
+    filesystem entirely. Tests that mutate the templates directory can
+    call _dir_listing.cache_clear().
+    """
+    try:
+        with os.scandir(parent) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+
+
 def validate_required_files(file_paths: List[str]) -> Tuple[bool, List[str]]:
-    """Validate that required files exist."""
-    import os
-    from pathlib import Path
-    
+    """Validate that required files exist.
+
+    Paths are grouped by parent directory and each directory is listed
+    once (and cached); membership in the listing replaces a stat call
+    per file.
+    """
+    join, split = os.path.join, os.path.split
+
     missing_files = []
-    # Get templates directory relative to this module
-    template_dir = Path(__file__).parent.parent / "templates"
-    
-    for file_path in file_paths:
-        # Check in templates directory
-        template_path = template_dir / file_path
-        if not template_path.exists():
+    # dict.fromkeys dedups while keeping first-seen order, so a path
+    # passed twice is checked (and reported) once.
+    for file_path in dict.fromkeys(file_paths):
+        parent, name = split(join(_TEMPLATE_DIR, file_path))
+        if name not in _dir_listing(parent):
             missing_files.append(file_path)
-    
-    return len(missing_files) == 0, missing_files
\ No newline at end of file
+
+    return len(missing_files) == 0, missing_files
+
+
+def any_missing(file_paths: List[str]) -> bool:
+    """True as soon as one required file is absent.
+
+    Early-exit variant of validate_required_files for callers that
+    only need a go/no-go answer and not the full missing list.
+    """
+    join, split = os.path.join, os.path.split
+    for file_path in file_paths:
+        parent, name = split(join(_TEMPLATE_DIR, file_path))
+        if name not in _dir_listing(parent):
+            return True
+    return False